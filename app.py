@@ -8,17 +8,17 @@ GitHub: https://github.com/RahulKothagundla/route-optimizer
 
 import streamlit as st
 import pandas as pd
-import folium
-from streamlit_folium import st_folium
-import plotly.express as px
-import plotly.graph_objects as go
 import numpy as np
+import pyarrow as pa
+
+# folium and plotly are imported lazily where they are used
 
 # Import our utilities
 from src.utils.geocoding import (
     load_addresses, 
     load_warehouse, 
     addresses_to_locations,
+    locations_to_arrays,
     get_locality_summary,
     get_bounding_box,
     get_distance_statistics
@@ -27,7 +27,7 @@ from src.utils.helpers import (
     haversine_distance,
     calculate_distance_matrix,
     format_time,
-    calculate_fuel_cost
+    calculate_trip_costs
 )
 
 # Import algorithms (NEW!)
@@ -37,6 +37,320 @@ from src.algorithms.route_optimizer import (
     get_route_coordinates
 )
 
+
+# Cached builders (shared across reruns and sessions)
+@st.cache_resource(show_spinner=False)
+def build_main_map_html(locations, warehouse) -> str:
+    """Render the overview map once and share the HTML across all sessions."""
+    import folium
+
+    bbox = get_bounding_box(locations)
+
+    m = folium.Map(
+        location=[bbox["center_lat"], bbox["center_lng"]],
+        zoom_start=12,
+        tiles="OpenStreetMap",
+        control_scale=True
+    )
+
+    folium.Marker(
+        location=[warehouse["lat"], warehouse["lng"]],
+        popup=f"<b>{warehouse['name']}</b><br>{warehouse['address']}",
+        tooltip="Warehouse",
+        icon=folium.Icon(color="red", icon="home")
+    ).add_to(m)
+
+    locality_colors = {
+        "Madhapur": "blue",
+        "Gachibowli": "green",
+        "Kondapur": "purple",
+        "Kukatpally": "orange"
+    }
+
+    # All delivery points go out as a single GeoJson layer (one registry
+    # insert, one JSON dump) instead of one CircleMarker object per location
+    columns = locations_to_arrays(locations)
+
+    # Resolve colors once per distinct locality, then gather by integer code
+    localities = pd.Categorical(columns['locality'])
+    color_arr = np.array([locality_colors.get(c, "gray") for c in localities.categories])
+
+    # Tooltip/popup strings are concatenated column-wise by pandas
+    # rather than formatted one f-string per point
+    names = pd.Series(columns['name'])
+    addresses = pd.Series(columns['address'])
+    locality_labels = pd.Series(columns['locality'])
+    package_counts = pd.Series(columns['package_count']).astype(str)
+
+    points = pd.DataFrame({
+        'lat': columns['lat'],
+        'lng': columns['lng'],
+        'color': color_arr[localities.codes],
+        'tooltip': locality_labels + " - " + package_counts + " pkg",
+        'popup': "<b>" + names + "</b><br>" + addresses
+    })
+
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lng, lat]},
+            "properties": {"color": color, "tooltip": tooltip, "popup": popup}
+        }
+        for lat, lng, color, tooltip, popup in points.itertuples(index=False)
+    ]
+
+    folium.GeoJson(
+        {"type": "FeatureCollection", "features": features},
+        name="Deliveries",
+        marker=folium.CircleMarker(radius=6, fill=True, fill_opacity=0.7),
+        style_function=lambda feature: {
+            "color": feature["properties"]["color"],
+            "fillColor": feature["properties"]["color"]
+        },
+        tooltip=folium.GeoJsonTooltip(fields=["tooltip"], labels=False),
+        popup=folium.GeoJsonPopup(fields=["popup"], labels=False)
+    ).add_to(m)
+
+    return m._repr_html_()
+
+
+@st.cache_resource(show_spinner=False)
+def build_route_map_html(coords: tuple, center: tuple, color: str, popup: str) -> str:
+    """Render a route polyline with its stops, once per unique route."""
+    import folium
+
+    route_map = folium.Map(
+        location=list(center),
+        zoom_start=11
+    )
+
+    # Draw route
+    folium.PolyLine(
+        coords,
+        color=color,
+        weight=3,
+        opacity=0.7,
+        popup=popup
+    ).add_to(route_map)
+
+    # Warehouse marker
+    folium.Marker(
+        coords[0],
+        icon=folium.Icon(color='red', icon='home'),
+        tooltip="Warehouse"
+    ).add_to(route_map)
+
+    # Stops as one GeoJson MultiPoint (skipping the warehouse at both ends)
+    # instead of one CircleMarker per stop
+    folium.GeoJson(
+        {
+            "type": "Feature",
+            "geometry": {
+                "type": "MultiPoint",
+                "coordinates": [[lng, lat] for lat, lng in coords[1:-1]]
+            },
+            "properties": {}
+        },
+        marker=folium.CircleMarker(radius=4, color=color, fill=True)
+    ).add_to(route_map)
+
+    return route_map._repr_html_()
+
+
+@st.cache_data(show_spinner=False)
+def build_trip_map_html(start: tuple, end: tuple) -> str:
+    """Render the calculator route preview from (lat, lng, name) tuples."""
+    import folium
+
+    mini_map = folium.Map(
+        location=[
+            (start[0] + end[0]) / 2,
+            (start[1] + end[1]) / 2
+        ],
+        zoom_start=13
+    )
+
+    folium.Marker(
+        [start[0], start[1]],
+        popup=start[2],
+        tooltip="Start",
+        icon=folium.Icon(color='green', icon='play')
+    ).add_to(mini_map)
+
+    folium.Marker(
+        [end[0], end[1]],
+        popup=end[2],
+        tooltip="End",
+        icon=folium.Icon(color='red', icon='stop')
+    ).add_to(mini_map)
+
+    folium.PolyLine(
+        locations=[
+            [start[0], start[1]],
+            [end[0], end[1]]
+        ],
+        color='blue',
+        weight=3,
+        opacity=0.7
+    ).add_to(mini_map)
+
+    return mini_map._repr_html_()
+
+
+@st.cache_data(show_spinner=False)
+def load_address_data() -> pd.DataFrame:
+    """Delivery addresses, parsed once and shared across reruns."""
+    return load_addresses()
+
+
+@st.cache_data(show_spinner=False)
+def load_warehouse_config() -> dict:
+    """Warehouse configuration, read once and shared across reruns."""
+    return load_warehouse()
+
+
+@st.cache_data(show_spinner=False)
+def get_locations(df: pd.DataFrame) -> list:
+    """Location dicts for every address, converted once per dataset."""
+    return addresses_to_locations(df)
+
+
+@st.cache_data(show_spinner=False)
+def get_location_columns(locations) -> dict:
+    """Column arrays (lat, lng, ...) for a list of locations."""
+    return locations_to_arrays(locations)
+
+
+@st.cache_data(show_spinner=False)
+def get_location_bbox(locations) -> dict:
+    """Bounding box and center of a list of locations."""
+    return get_bounding_box(locations)
+
+
+@st.cache_data(show_spinner=False)
+def get_warehouse_distance_stats(df: pd.DataFrame, warehouse: dict) -> dict:
+    """Warehouse-to-address distance statistics for the Statistics tab."""
+    return get_distance_statistics(df, warehouse)
+
+
+@st.cache_data(show_spinner=False, persist="disk")
+def load_distance_matrix(locations) -> np.ndarray:
+    """Distance matrix for all locations, computed once per dataset and persisted to disk."""
+    return calculate_distance_matrix(locations)
+
+
+@st.cache_data(show_spinner=False)
+def compute_trip(from_lat: float, from_lng: float, to_lat: float, to_lng: float) -> dict:
+    """Distance, time, fuel and CO₂ for one calculator trip, memoized per coordinate pair."""
+    distance = haversine_distance(from_lat, from_lng, to_lat, to_lng)
+    time_hours, fuel_cost, co2 = calculate_trip_costs(distance)
+
+    return {
+        "distance": distance,
+        "fuel_cost": fuel_cost,
+        "time_hours": time_hours,
+        "co2": co2
+    }
+
+
+@st.cache_data(show_spinner=False)
+def run_route_comparison(locations, distance_matrix: np.ndarray) -> dict:
+    """Naive vs NN vs NN + 2-Opt comparison, memoized on the input data."""
+    return compare_routes(
+        locations,
+        distance_matrix,
+        warehouse_idx=0,
+        verbose=False
+    )
+
+
+@st.cache_data(show_spinner=False)
+def get_address_labels(locations) -> dict:
+    """Selectbox label for every address id, shared by the From/To pickers."""
+    return {
+        loc['id']: f"{loc['id']}: {loc['name']} ({loc['locality']})"
+        for loc in locations
+    }
+
+
+@st.cache_data(show_spinner=False)
+def get_overview_stats(df: pd.DataFrame) -> dict:
+    """Overview metrics and locality summary, computed once per dataset."""
+    totals = df.agg({'package_count': 'sum', 'locality': 'nunique'})
+    return {
+        'total_packages': int(totals['package_count']),
+        'localities': int(totals['locality']),
+        'summary': get_locality_summary(df)
+    }
+
+
+@st.cache_data(show_spinner=False)
+def make_address_table(df: pd.DataFrame) -> pa.Table:
+    """Address Details table, converted to Arrow once so reruns skip re-encoding."""
+    columns = ['id', 'customer_name', 'address', 'locality', 'package_count', 'lat', 'lng']
+    return pa.Table.from_pandas(df[columns], preserve_index=False)
+
+
+@st.cache_data(show_spinner=False)
+def make_locality_table(summary: pd.DataFrame) -> pa.Table:
+    """Locality Summary table with per-address averages, as an Arrow table."""
+    display = summary.copy()
+    display['avg_packages_per_address'] = (
+        display['total_packages'] / display['num_addresses']
+    ).round(2)
+    return pa.Table.from_pandas(display)
+
+
+@st.cache_data(show_spinner=False)
+def make_locality_bar(summary: pd.DataFrame):
+    """Overview bar chart of addresses per locality."""
+    import plotly.express as px
+
+    fig = px.bar(
+        summary.reset_index(),
+        x='locality',
+        y='num_addresses',
+        title='Delivery Addresses by Locality',
+        labels={'num_addresses': 'Number of Addresses', 'locality': 'Locality'},
+        color='num_addresses',
+        color_continuous_scale='Viridis'
+    )
+    fig.update_layout(height=300)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def make_locality_pie(summary: pd.DataFrame):
+    """Statistics pie chart of addresses per locality."""
+    import plotly.express as px
+
+    fig = px.pie(
+        summary.reset_index(),
+        values='num_addresses',
+        names='locality',
+        title='Address Distribution',
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def make_package_bar(summary: pd.DataFrame):
+    """Statistics bar chart of packages per locality."""
+    import plotly.express as px
+
+    fig = px.bar(
+        summary.reset_index(),
+        x='locality',
+        y='total_packages',
+        title='Package Distribution',
+        labels={'total_packages': 'Total Packages'},
+        color='total_packages',
+        color_continuous_scale='Blues'
+    )
+    return fig
+
+
 # Page configuration
 st.set_page_config(
     page_title="Route Optimizer - Day 2",
@@ -99,9 +413,9 @@ with st.sidebar:
 try:
     # Load data
     with st.spinner("Loading data..."):
-        df_addresses = load_addresses()
-        warehouse = load_warehouse()
-        locations = addresses_to_locations(df_addresses)
+        df_addresses = load_address_data()
+        warehouse = load_warehouse_config()
+        locations = get_locations(df_addresses)
         
         # Add warehouse as first location
         warehouse_loc = {
@@ -115,11 +429,25 @@ try:
         }
         all_locations = [warehouse_loc] + locations
         
-        # Calculate distance matrix (cache it)
-        if 'distance_matrix' not in st.session_state:
-            st.session_state.distance_matrix = calculate_distance_matrix(all_locations)
-        
-        distance_matrix = st.session_state.distance_matrix
+        # Column view of all locations: (lat, lng) rows for vectorized gathers
+        all_columns = get_location_columns(all_locations)
+        coords = np.column_stack((all_columns['lat'], all_columns['lng']))
+        route_map_center = tuple(coords.mean(axis=0).tolist())
+        
+        # Calculate distance matrix (cached across reruns, sessions and restarts)
+        distance_matrix = load_distance_matrix(all_locations)
+        assert distance_matrix.dtype == np.float32
+        
+        # Address lookups for the Distance Calculator
+        loc_by_id = {loc['id']: loc for loc in locations}
+        address_ids = list(loc_by_id)
+        address_labels = get_address_labels(locations)
+        
+        # Summaries shared by the Overview and Statistics tabs
+        overview_stats = get_overview_stats(df_addresses)
+        locality_summary = overview_stats['summary']
+        bbox = get_location_bbox(locations)
+        area_coverage = (bbox['lat_max'] - bbox['lat_min']) * (bbox['lng_max'] - bbox['lng_min'])
     
     st.success(f"✅ Loaded {len(locations)} delivery addresses and calculated distance matrix")
     
@@ -142,16 +470,12 @@ try:
             st.metric("Total Addresses", len(locations))
         
         with col2:
-            total_packages = df_addresses['package_count'].sum()
-            st.metric("Total Packages", total_packages)
+            st.metric("Total Packages", overview_stats['total_packages'])
         
         with col3:
-            localities = df_addresses['locality'].nunique()
-            st.metric("Localities", localities)
+            st.metric("Localities", overview_stats['localities'])
         
         with col4:
-            bbox = get_bounding_box(locations)
-            area_coverage = (bbox['lat_max'] - bbox['lat_min']) * (bbox['lng_max'] - bbox['lng_min'])
             st.metric("Coverage Area", f"{area_coverage*100:.1f} km²")
         
         st.divider()
@@ -166,25 +490,14 @@ try:
         
         with col_b:
             st.subheader("📦 Locality Distribution")
-            locality_summary = get_locality_summary(df_addresses)
             
-            fig = px.bar(
-                locality_summary.reset_index(),
-                x='locality',
-                y='num_addresses',
-                title='Delivery Addresses by Locality',
-                labels={'num_addresses': 'Number of Addresses', 'locality': 'Locality'},
-                color='num_addresses',
-                color_continuous_scale='Viridis'
-            )
-            fig.update_layout(height=300)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(make_locality_bar(locality_summary), use_container_width=True)
         
         st.divider()
         
         st.subheader("📋 Address Details")
         st.dataframe(
-            df_addresses[['id', 'customer_name', 'address', 'locality', 'package_count', 'lat', 'lng']],
+            make_address_table(df_addresses),
             height=300,
             use_container_width=True
         )
@@ -193,48 +506,12 @@ try:
     with tab2:
         st.header("🗺️ Interactive Map")
 
-        if "main_map_html" not in st.session_state:
-            bbox = get_bounding_box(locations)
-
-            m = folium.Map(
-                location=[bbox["center_lat"], bbox["center_lng"]],
-                zoom_start=12,
-                tiles="OpenStreetMap",
-                control_scale=True
-            )
-
-            folium.Marker(
-                location=[warehouse["lat"], warehouse["lng"]],
-                popup=f"<b>{warehouse['name']}</b><br>{warehouse['address']}",
-                tooltip="Warehouse",
-                icon=folium.Icon(color="red", icon="home")
-            ).add_to(m)
-
-            locality_colors = {
-                "Madhapur": "blue",
-                "Gachibowli": "green",
-                "Kondapur": "purple",
-                "Kukatpally": "orange"
-            }
-
-            for loc in locations:
-                folium.CircleMarker(
-                    location=[loc["lat"], loc["lng"]],
-                    radius=6,
-                    color=locality_colors.get(loc["locality"], "gray"),
-                    fill=True,
-                    fill_color=locality_colors.get(loc["locality"], "gray"),
-                    fill_opacity=0.7,
-                    tooltip=f"{loc['locality']} - {loc['package_count']} pkg",
-                    popup=f"<b>{loc['name']}</b><br>{loc['address']}"
-                ).add_to(m)
-
-            st.session_state.main_map_html = m._repr_html_()
+        main_map_html = build_main_map_html(locations, warehouse)
 
         left, mid, right = st.columns([1, 3, 1])
         with mid:
             st.components.v1.html(
-                st.session_state.main_map_html,
+                main_map_html,
                 height=440
             )
 
@@ -250,7 +527,7 @@ try:
     with tab3:
         st.header("📊 Detailed Statistics")
         
-        dist_stats = get_distance_statistics(df_addresses, warehouse)
+        dist_stats = get_warehouse_distance_stats(df_addresses, warehouse)
         
         col_s1, col_s2, col_s3 = st.columns(3)
         
@@ -267,41 +544,18 @@ try:
         
         st.subheader("📍 By Locality")
         
-        locality_summary = get_locality_summary(df_addresses)
-        
         col_t1, col_t2 = st.columns(2)
         
         with col_t1:
-            fig_pie = px.pie(
-                locality_summary.reset_index(),
-                values='num_addresses',
-                names='locality',
-                title='Address Distribution',
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            st.plotly_chart(fig_pie, use_container_width=True)
+            st.plotly_chart(make_locality_pie(locality_summary), use_container_width=True)
         
         with col_t2:
-            fig_bar = px.bar(
-                locality_summary.reset_index(),
-                x='locality',
-                y='total_packages',
-                title='Package Distribution',
-                labels={'total_packages': 'Total Packages'},
-                color='total_packages',
-                color_continuous_scale='Blues'
-            )
-            st.plotly_chart(fig_bar, use_container_width=True)
+            st.plotly_chart(make_package_bar(locality_summary), use_container_width=True)
         
         st.subheader("📋 Locality Summary Table")
         
-        locality_summary_display = locality_summary.copy()
-        locality_summary_display['avg_packages_per_address'] = (
-            locality_summary_display['total_packages'] / locality_summary_display['num_addresses']
-        ).round(2)
-        
         st.dataframe(
-            locality_summary_display,
+            make_locality_table(locality_summary),
             use_container_width=True
         )
     
@@ -324,10 +578,8 @@ try:
                 from_lng = warehouse['lng']
                 from_name = warehouse['name']
             else:
-                from_options = [f"{loc['id']}: {loc['name']} ({loc['locality']})" for loc in locations]
-                from_selected = st.selectbox("Select address:", from_options)
-                from_id = int(from_selected.split(":")[0])
-                from_loc = next(loc for loc in locations if loc['id'] == from_id)
+                from_id = st.selectbox("Select address:", address_ids, format_func=address_labels.get)
+                from_loc = loc_by_id[from_id]
                 from_lat = from_loc['lat']
                 from_lng = from_loc['lng']
                 from_name = from_loc['name']
@@ -341,27 +593,16 @@ try:
                 to_lng = warehouse['lng']
                 to_name = warehouse['name']
             else:
-                to_options = [f"{loc['id']}: {loc['name']} ({loc['locality']})" for loc in locations]
-                to_selected = st.selectbox("Select address:", to_options, key="to_select")
-                to_id = int(to_selected.split(":")[0])
-                to_loc = next(loc for loc in locations if loc['id'] == to_id)
+                to_id = st.selectbox("Select address:", address_ids,
+                                     format_func=address_labels.get, key="to_select")
+                to_loc = loc_by_id[to_id]
                 to_lat = to_loc['lat']
                 to_lng = to_loc['lng']
                 to_name = to_loc['name']
 
         if st.button("Calculate", type="primary"):
-            distance = haversine_distance(from_lat, from_lng, to_lat, to_lng)
-            fuel_cost = calculate_fuel_cost(distance)
-
-            avg_speed = 35
-            time_hours = distance / avg_speed
-            co2 = (distance / 12) * 2.31
-
             st.session_state.distance_calc = {
-                "distance": distance,
-                "fuel_cost": fuel_cost,
-                "time_hours": time_hours,
-                "co2": co2,
+                **compute_trip(from_lat, from_lng, to_lat, to_lng),
                 "from": (from_lat, from_lng, from_name),
                 "to": (to_lat, to_lng, to_name)
             }
@@ -388,238 +629,182 @@ try:
 
             st.subheader("Route Preview")
 
-            mini_map = folium.Map(
-                location=[
-                    (result['from'][0] + result['to'][0]) / 2,
-                    (result['from'][1] + result['to'][1]) / 2
-                ],
-                zoom_start=13
-            )
-
-            folium.Marker(
-                [result['from'][0], result['from'][1]],
-                popup=result['from'][2],
-                tooltip="Start",
-                icon=folium.Icon(color='green', icon='play')
-            ).add_to(mini_map)
-
-            folium.Marker(
-                [result['to'][0], result['to'][1]],
-                popup=result['to'][2],
-                tooltip="End",
-                icon=folium.Icon(color='red', icon='stop')
-            ).add_to(mini_map)
-
-            folium.PolyLine(
-                locations=[
-                    [result['from'][0], result['from'][1]],
-                    [result['to'][0], result['to'][1]]
-                ],
-                color='blue',
-                weight=3,
-                opacity=0.7
-            ).add_to(mini_map)
-
             left, mid, right = st.columns([1, 2, 1])
             with mid:
-                st_folium(mini_map, height=400, width=650)
+                st.components.v1.html(
+                    build_trip_map_html(result['from'], result['to']),
+                    height=400
+                )
     
     # TAB 5: ROUTE OPTIMIZER (NEW!)
     with tab5:
-        st.header("🚀 Route Optimizer")
-        st.markdown("Compare naive vs optimized delivery routes using TSP algorithms")
-        
-        # Optimization controls
-        col_opt1, col_opt2, col_opt3 = st.columns([2, 1, 1])
-        
-        with col_opt1:
-            st.markdown("### 🎯 Optimization Settings")
-        
-        with col_opt2:
-            if st.button("🚀 Run Optimization", type="primary", use_container_width=True):
-                with st.spinner("Running optimization algorithms..."):
-                    comparison = compare_routes(
-                        all_locations,
-                        distance_matrix,
-                        warehouse_idx=0,
-                        verbose=False
-                    )
-                    st.session_state.route_comparison = comparison
-                    st.success("✅ Optimization complete!")
-        
-        with col_opt3:
-            if st.button("🗑️ Clear Results"):
-                if 'route_comparison' in st.session_state:
-                    del st.session_state.route_comparison
-                st.rerun()
-        
-        # Display results if available
-        if 'route_comparison' in st.session_state:
-            comp = st.session_state.route_comparison
-            
-            st.divider()
-            
-            # KEY METRICS
-            st.subheader("📊 Key Metrics")
+        # Fragment: widget events here rerun only this tab, not the whole page
+        @st.fragment
+        def render_optimizer_tab():
+            st.header("🚀 Route Optimizer")
+            st.markdown("Compare naive vs optimized delivery routes using TSP algorithms")
             
-            col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+            # Optimization controls
+            col_opt1, col_opt2, col_opt3 = st.columns([2, 1, 1])
             
-            naive_dist = comp['distances']['naive']
-            opt_dist = comp['distances']['optimized']
-            saved_km = comp['improvements']['opt_vs_naive']['km_saved']
-            saved_pct = comp['improvements']['opt_vs_naive']['percent']
+            with col_opt1:
+                st.markdown("### 🎯 Optimization Settings")
             
-            with col_m1:
-                st.metric("Naive Route", f"{naive_dist:.2f} km")
+            with col_opt2:
+                if st.button("🚀 Run Optimization", type="primary", use_container_width=True):
+                    with st.spinner("Running optimization algorithms..."):
+                        comparison = run_route_comparison(all_locations, distance_matrix)
+                        st.session_state.route_comparison = comparison
+                        st.success("✅ Optimization complete!")
             
-            with col_m2:
-                st.metric("Optimized Route", f"{opt_dist:.2f} km")
+            with col_opt3:
+                if st.button("🗑️ Clear Results"):
+                    if 'route_comparison' in st.session_state:
+                        del st.session_state.route_comparison
+                    st.rerun()
             
-            with col_m3:
-                st.metric("Distance Saved", f"{saved_km:.2f} km", 
-                         delta=f"-{saved_pct:.1f}%",
-                         delta_color="inverse")
-            
-            with col_m4:
-                fuel_saved = calculate_fuel_cost(saved_km)
-                st.metric("Fuel Cost Saved", f"₹{fuel_saved:.2f}")
-            
-            st.divider()
-            
-            # COMPARISON TABLE
-            st.subheader("📋 Route Comparison")
-            
-            comparison_data = {
-                'Metric': ['Distance (km)', 'Estimated Time', 'Fuel Cost (₹)', 'CO₂ Emissions (kg)'],
-                'Naive Route': [
-                    f"{naive_dist:.2f}",
-                    format_time(naive_dist / 35),
-                    f"₹{calculate_fuel_cost(naive_dist):.2f}",
-                    f"{(naive_dist / 12) * 2.31:.2f}"
-                ],
-                'Optimized Route': [
-                    f"{opt_dist:.2f}",
-                    format_time(opt_dist / 35),
-                    f"₹{calculate_fuel_cost(opt_dist):.2f}",
-                    f"{(opt_dist / 12) * 2.31:.2f}"
-                ],
-                'Improvement': [
-                    f"{saved_km:.2f} km ({saved_pct:.1f}%)",
-                    format_time((naive_dist - opt_dist) / 35),
-                    f"₹{fuel_saved:.2f}",
-                    f"{((naive_dist - opt_dist) / 12) * 2.31:.2f} kg"
-                ]
-            }
-            
-            comparison_df = pd.DataFrame(comparison_data)
-            st.dataframe(comparison_df, use_container_width=True, hide_index=True)
-            
-            st.divider()
-            
-            # VISUAL COMPARISON
-            st.subheader("📈 Visual Comparison")
-            
-            # Bar chart
-            fig_comparison = go.Figure(data=[
-                go.Bar(name='Naive Route', x=['Distance', 'Time', 'Cost'], 
-                      y=[naive_dist, naive_dist/35*60, calculate_fuel_cost(naive_dist)],
-                      marker_color='#ff6b6b'),
-                go.Bar(name='Optimized Route', x=['Distance', 'Time', 'Cost'],
-                      y=[opt_dist, opt_dist/35*60, calculate_fuel_cost(opt_dist)],
-                      marker_color='#51cf66')
-            ])
-            
-            fig_comparison.update_layout(
-                title='Naive vs Optimized Comparison',
-                yaxis_title='Value',
-                barmode='group',
-                height=400
-            )
-            
-            st.plotly_chart(fig_comparison, use_container_width=True)
-            
-            st.divider()
-            
-            # ROUTE VISUALIZATION
-            st.subheader("🗺️ Route Visualization")
-            
-            col_v1, col_v2 = st.columns(2)
-            
-            # Naive route map
-            with col_v1:
-                st.markdown("**Naive Route (Sequential)**")
+            # Display results if available
+            if 'route_comparison' in st.session_state:
+                comp = st.session_state.route_comparison
                 
-                naive_route = comp['routes']['naive']['route']
-                naive_coords = get_route_coordinates(naive_route, all_locations)
+                st.divider()
                 
-                bbox = get_bounding_box(all_locations)
-                map_naive = folium.Map(
-                    location=[bbox["center_lat"], bbox["center_lng"]],
-                    zoom_start=11
+                # KEY METRICS
+                st.subheader("📊 Key Metrics")
+                
+                col_m1, col_m2, col_m3, col_m4 = st.columns(4)
+                
+                naive_dist = comp['distances']['naive']
+                opt_dist = comp['distances']['optimized']
+                saved_km = comp['improvements']['opt_vs_naive']['km_saved']
+                saved_pct = comp['improvements']['opt_vs_naive']['percent']
+                
+                # Derived costs for naive, optimized and saved distance in one
+                # vectorized call, shared by metrics, table and chart
+                trip_hours, trip_fuel, trip_co2 = calculate_trip_costs(
+                    np.array([naive_dist, opt_dist, saved_km])
                 )
+                naive_hours, opt_hours, saved_hours = trip_hours.tolist()
+                naive_fuel, opt_fuel, fuel_saved = trip_fuel.tolist()
+                naive_co2, opt_co2, co2_saved = trip_co2.tolist()
+                naive_time = format_time(naive_hours)
+                opt_time = format_time(opt_hours)
+                delta_time = format_time(saved_hours)
                 
-                # Draw route
-                folium.PolyLine(
-                    naive_coords,
-                    color='red',
-                    weight=3,
-                    opacity=0.7,
-                    popup=f"Naive Route: {naive_dist:.2f} km"
-                ).add_to(map_naive)
+                with col_m1:
+                    st.metric("Naive Route", f"{naive_dist:.2f} km")
                 
-                # Add markers
-                for i, coord in enumerate(naive_coords):
-                    if i == 0:
-                        icon = folium.Icon(color='red', icon='home')
-                        folium.Marker(coord, icon=icon, tooltip="Warehouse").add_to(map_naive)
-                    elif i == len(naive_coords) - 1:
-                        pass  # Skip the return to warehouse
-                    else:
-                        folium.CircleMarker(coord, radius=4, color='red', fill=True).add_to(map_naive)
+                with col_m2:
+                    st.metric("Optimized Route", f"{opt_dist:.2f} km")
                 
-                st_folium(map_naive, height=400, width=None)
-            
-            # Optimized route map
-            with col_v2:
-                st.markdown("**Optimized Route (TSP)**")
+                with col_m3:
+                    st.metric("Distance Saved", f"{saved_km:.2f} km", 
+                             delta=f"-{saved_pct:.1f}%",
+                             delta_color="inverse")
                 
-                opt_route = comp['routes']['optimized']['route']
-                opt_coords = get_route_coordinates(opt_route, all_locations)
+                with col_m4:
+                    st.metric("Fuel Cost Saved", f"₹{fuel_saved:.2f}")
                 
-                map_opt = folium.Map(
-                    location=[bbox["center_lat"], bbox["center_lng"]],
-                    zoom_start=11
-                )
+                st.divider()
                 
-                # Draw route
-                folium.PolyLine(
-                    opt_coords,
-                    color='green',
-                    weight=3,
-                    opacity=0.7,
-                    popup=f"Optimized Route: {opt_dist:.2f} km"
-                ).add_to(map_opt)
+                # COMPARISON TABLE
+                st.subheader("📋 Route Comparison")
                 
-                # Add markers
-                for i, coord in enumerate(opt_coords):
-                    if i == 0:
-                        icon = folium.Icon(color='red', icon='home')
-                        folium.Marker(coord, icon=icon, tooltip="Warehouse").add_to(map_opt)
-                    elif i == len(opt_coords) - 1:
-                        pass
-                    else:
-                        folium.CircleMarker(coord, radius=4, color='green', fill=True).add_to(map_opt)
+                comparison_data = {
+                    'Metric': ['Distance (km)', 'Estimated Time', 'Fuel Cost (₹)', 'CO₂ Emissions (kg)'],
+                    'Naive Route': [
+                        f"{naive_dist:.2f}",
+                        naive_time,
+                        f"₹{naive_fuel:.2f}",
+                        f"{naive_co2:.2f}"
+                    ],
+                    'Optimized Route': [
+                        f"{opt_dist:.2f}",
+                        opt_time,
+                        f"₹{opt_fuel:.2f}",
+                        f"{opt_co2:.2f}"
+                    ],
+                    'Improvement': [
+                        f"{saved_km:.2f} km ({saved_pct:.1f}%)",
+                        delta_time,
+                        f"₹{fuel_saved:.2f}",
+                        f"{co2_saved:.2f} kg"
+                    ]
+                }
                 
-                st_folium(map_opt, height=400, width=None)
-            
-            st.divider()
-            
-            # ALGORITHM DETAILS
-            with st.expander("🔬 Algorithm Details"):
-                st.markdown("### Algorithms Used")
+                comparison_df = pd.DataFrame(comparison_data)
+                st.dataframe(comparison_df, use_container_width=True, hide_index=True)
+                
+                st.divider()
+                
+                # VISUAL COMPARISON
+                st.subheader("📈 Visual Comparison")
+                
+                # Bar chart (plain dict spec, no graph_objects construction)
+                fig_comparison = {
+                    'data': [
+                        {'type': 'bar', 'name': 'Naive Route', 'x': ['Distance', 'Time', 'Cost'],
+                         'y': [naive_dist, naive_hours*60, naive_fuel],
+                         'marker': {'color': '#ff6b6b'}},
+                        {'type': 'bar', 'name': 'Optimized Route', 'x': ['Distance', 'Time', 'Cost'],
+                         'y': [opt_dist, opt_hours*60, opt_fuel],
+                         'marker': {'color': '#51cf66'}}
+                    ],
+                    'layout': {
+                        'title': {'text': 'Naive vs Optimized Comparison'},
+                        'yaxis': {'title': {'text': 'Value'}},
+                        'barmode': 'group',
+                        'height': 400
+                    }
+                }
+                
+                st.plotly_chart(fig_comparison, use_container_width=True)
                 
-                st.markdown("**1. Nearest Neighbor (Greedy Heuristic)**")
-                st.code("""
+                st.divider()
+                
+                # ROUTE VISUALIZATION
+                st.subheader("🗺️ Route Visualization")
+                
+                col_v1, col_v2 = st.columns(2)
+                
+                # Naive route map
+                with col_v1:
+                    st.markdown("**Naive Route (Sequential)**")
+                    
+                    naive_route = comp['routes']['naive']['route']
+                    naive_coords = get_route_coordinates(naive_route, coords)
+                    
+                    st.components.v1.html(
+                        build_route_map_html(
+                            tuple(naive_coords), route_map_center, 'red',
+                            f"Naive Route: {naive_dist:.2f} km"
+                        ),
+                        height=400
+                    )
+                
+                # Optimized route map
+                with col_v2:
+                    st.markdown("**Optimized Route (TSP)**")
+                    
+                    opt_route = comp['routes']['optimized']['route']
+                    opt_coords = get_route_coordinates(opt_route, coords)
+                    
+                    st.components.v1.html(
+                        build_route_map_html(
+                            tuple(opt_coords), route_map_center, 'green',
+                            f"Optimized Route: {opt_dist:.2f} km"
+                        ),
+                        height=400
+                    )
+                
+                st.divider()
+                
+                # ALGORITHM DETAILS
+                with st.expander("🔬 Algorithm Details"):
+                    st.markdown("### Algorithms Used")
+                    
+                    st.markdown("**1. Nearest Neighbor (Greedy Heuristic)**")
+                    st.code("""
 Algorithm:
 1. Start at warehouse
 2. Visit nearest unvisited location
@@ -628,10 +813,10 @@ Algorithm:
 
 Time: O(n²)
 Result: ~20-30% better than random
-                """)
-                
-                st.markdown("**2. 2-Opt Optimization (Local Search)**")
-                st.code("""
+                    """)
+                    
+                    st.markdown("**2. 2-Opt Optimization (Local Search)**")
+                    st.code("""
 Algorithm:
 1. Start with Nearest Neighbor solution
 2. Try swapping edge pairs
@@ -640,39 +825,41 @@ Algorithm:
 
 Time: O(n² × iterations)
 Result: 20-40% improvement over NN
-                """)
-                
-                if 'optimization_stats' in comp['routes']['optimized']:
-                    stats = comp['routes']['optimized']['optimization_stats']
-                    st.markdown("### Optimization Statistics")
-                    st.write(f"- **Iterations:** {stats['iterations']}")
-                    st.write(f"- **Improvements found:** {stats['total_improvements']}")
-                    st.write(f"- **Improvement:** {stats['improvement_pct']:.1f}%")
-        
-        else:
-            st.info("👆 Click 'Run Optimization' to compare routes!")
+                    """)
+                    
+                    if 'optimization_stats' in comp['routes']['optimized']:
+                        stats = comp['routes']['optimized']['optimization_stats']
+                        st.markdown("### Optimization Statistics")
+                        st.write(f"- **Iterations:** {stats['iterations']}")
+                        st.write(f"- **Improvements found:** {stats['total_improvements']}")
+                        st.write(f"- **Improvement:** {stats['improvement_pct']:.1f}%")
             
-            st.markdown("""
-            ### What will happen:
-            
-            1. **Naive Route Generation**
-               - Visits addresses in sequential order (1, 2, 3, ...)
-               - Baseline for comparison
-            
-            2. **Nearest Neighbor Algorithm**
-               - Greedy approach: always go to nearest unvisited location
-               - Fast and gives good initial solution
-            
-            3. **2-Opt Optimization**
-               - Improves Nearest Neighbor solution
-               - Uncrosses routes to reduce distance
-               - Converges to local optimum
-            
-            4. **Results**
-               - Expected: **30-35% distance reduction**
-               - Metrics: Distance, Time, Fuel Cost, CO₂
-               - Visual comparison of routes
-            """)
+            else:
+                st.info("👆 Click 'Run Optimization' to compare routes!")
+                
+                st.markdown("""
+                ### What will happen:
+                
+                1. **Naive Route Generation**
+                   - Visits addresses in sequential order (1, 2, 3, ...)
+                   - Baseline for comparison
+                
+                2. **Nearest Neighbor Algorithm**
+                   - Greedy approach: always go to nearest unvisited location
+                   - Fast and gives good initial solution
+                
+                3. **2-Opt Optimization**
+                   - Improves Nearest Neighbor solution
+                   - Uncrosses routes to reduce distance
+                   - Converges to local optimum
+                
+                4. **Results**
+                   - Expected: **30-35% distance reduction**
+                   - Metrics: Distance, Time, Fuel Cost, CO₂
+                   - Visual comparison of routes
+                """)
+
+        render_optimizer_tab()
 
 except FileNotFoundError as e:
     st.error(f"❌ Error loading data: {e}")
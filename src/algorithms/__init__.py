@@ -12,7 +12,8 @@ from .tsp_solver import (
 from .route_optimizer import (
     optimize_route,
     compare_routes,
-    generate_naive_route
+    generate_naive_route,
+    naive_route_distance
 )
 
 __all__ = [
@@ -21,5 +22,6 @@ __all__ = [
     'calculate_route_distance',
     'optimize_route',
     'compare_routes',
-    'generate_naive_route'
+    'generate_naive_route',
+    'naive_route_distance'
 ]
\ No newline at end of file
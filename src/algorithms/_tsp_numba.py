@@ -0,0 +1,290 @@
+"""
+Numba kernels for the TSP solver
+Importing this module raises ImportError when numba is not installed
+"""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, inline='always')
+def _condensed_distance(Dc, n, i, j):
+    """
+    Distance i-j from a condensed upper triangle (scipy squareform order).
+    """
+    if i == j:
+        return 0.0
+    if i > j:
+        i, j = j, i
+    return np.float64(Dc[i * (2 * n - i - 1) // 2 + (j - i - 1)])
+
+
+@njit(cache=True, nogil=True)
+def _apply_two_opt(route, pos, dont_look, k1, k2):
+    """
+    Replace edges k1 and k2 by reversing the route between them, in place.
+    """
+    # Moving these four endpoints may open new moves around them
+    dont_look[route[k1]] = False
+    dont_look[route[k1 + 1]] = False
+    dont_look[route[k2]] = False
+    dont_look[route[k2 + 1]] = False
+
+    lo = min(k1, k2) + 1
+    hi = max(k1, k2)
+    while lo < hi:
+        tmp = route[lo]
+        route[lo] = route[hi]
+        route[hi] = tmp
+        pos[route[lo]] = lo
+        pos[route[hi]] = hi
+        lo += 1
+        hi -= 1
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _two_opt_kernel(route, Dc, num_nodes, neighbors, max_iter, best_improvement):
+    """
+    Neighbor-list 2-opt with don't-look bits over a closed route, modified in place.
+
+    Same move order and acceptance rule as the pure-Python loop in
+    two_opt_optimization, compiled to machine code.
+
+    Args:
+        route: int32 array of location indices, first == last
+        Dc: float32 condensed upper triangle of the symmetric distance
+            matrix, half the bytes of the full matrix (sums are taken in float64)
+        num_nodes: Number of locations (side of the full matrix)
+        neighbors: int32 array, row a = nearest locations to a (ascending)
+        max_iter: Maximum number of full passes
+        best_improvement: Apply only the best move of each pass instead of
+            every improving move as it is found
+
+    Returns:
+        Tuple of (iterations, total_improvements)
+    """
+    last = route.shape[0] - 1
+
+    # Position of every location on the tour (start appears once, at 0)
+    pos = np.zeros(num_nodes, dtype=np.int32)
+    for p in range(last):
+        pos[route[p]] = p
+    dont_look = np.zeros(num_nodes, dtype=np.bool_)
+
+    iteration = 0
+    total_improvements = 0
+
+    improved = True
+    while improved and iteration < max_iter:
+        improved = False
+        iteration += 1
+        best_delta = -1e-12
+        best_k1 = -1
+        best_k2 = -1
+
+        for p in range(last):
+            a = route[p]
+            if dont_look[a]:
+                continue
+
+            found = False
+            # Edge k joins route[k] and route[k + 1]: try a's outgoing
+            # edge first, then its incoming one
+            for direction in range(2):
+                k1 = pos[a] if direction == 0 else pos[a] - 1
+                if k1 < 0:
+                    k1 = last - 1
+                x = route[k1]
+                y = route[k1 + 1]
+                removed = _condensed_distance(Dc, num_nodes, x, y)
+
+                for j in range(neighbors.shape[1]):
+                    c = neighbors[a, j]
+                    # Sorted neighbors: once a-c is no shorter than the
+                    # edge it would replace, no later c can help
+                    if _condensed_distance(Dc, num_nodes, a, c) >= removed:
+                        break
+
+                    k2 = pos[c] if direction == 0 else pos[c] - 1
+                    if k2 < 0:
+                        k2 = last - 1
+                    u = route[k2]
+                    v = route[k2 + 1]
+                    d_xu = _condensed_distance(Dc, num_nodes, x, u)
+                    d_yv = _condensed_distance(Dc, num_nodes, y, v)
+                    d_uv = _condensed_distance(Dc, num_nodes, u, v)
+                    delta = d_xu + d_yv - removed - d_uv
+
+                    # Rare once the tour settles: keep this branch short
+                    # and leave the work to _apply_two_opt
+                    if delta < -1e-12:
+                        found = True
+                        if not best_improvement:
+                            _apply_two_opt(route, pos, dont_look, k1, k2)
+                            break
+                        if delta < best_delta:
+                            best_delta = delta
+                            best_k1 = k1
+                            best_k2 = k2
+
+                if found and not best_improvement:
+                    break
+
+            if not found:
+                dont_look[a] = True
+            elif not best_improvement:
+                improved = True
+                total_improvements += 1
+
+        if best_k1 >= 0:
+            _apply_two_opt(route, pos, dont_look, best_k1, best_k2)
+            improved = True
+            total_improvements += 1
+
+    return iteration, total_improvements
+
+
+
+@njit(cache=True, nogil=True)
+def _apply_or_opt(route, pos, dont_look, chain, p, e, j, reverse):
+    """
+    Move the chain route[p..e] to sit after route[j], optionally reversed, in place.
+    """
+    # Moving these four endpoints may open new moves around them
+    dont_look[route[p - 1]] = False
+    dont_look[route[e + 1]] = False
+    dont_look[route[j]] = False
+    dont_look[route[j + 1]] = False
+
+    # Cut the chain out and splice it in after route[j]
+    length = e - p + 1
+    for t in range(length):
+        chain[t] = route[e - t] if reverse else route[p + t]
+    if j < p:
+        for q in range(p - 1, j, -1):
+            route[q + length] = route[q]
+        for t in range(length):
+            route[j + 1 + t] = chain[t]
+        lo = j + 1
+        hi = e
+    else:
+        for q in range(e + 1, j + 1):
+            route[q - length] = route[q]
+        for t in range(length):
+            route[j + 1 - length + t] = chain[t]
+        lo = p
+        hi = j
+    for q in range(lo, hi + 1):
+        pos[route[q]] = q
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _or_opt_kernel(route, Dc, num_nodes, neighbors, max_iter):
+    """
+    Or-opt with don't-look bits over a closed route, modified in place.
+
+    Moves a chain of 1-3 consecutive stops next to one of its first
+    stop's nearest neighbors, in whichever orientation is shorter. Same
+    move order and acceptance rule as _or_opt_python.
+
+    Args:
+        route: int32 array of location indices, first == last
+        Dc: float32 condensed upper triangle of the distance matrix
+        num_nodes: Number of locations (side of the full matrix)
+        neighbors: int32 array, row a = nearest locations to a (ascending)
+        max_iter: Maximum number of full passes
+
+    Returns:
+        Tuple of (iterations, total_improvements)
+    """
+    last = route.shape[0] - 1
+
+    pos = np.zeros(num_nodes, dtype=np.int32)
+    for p in range(last):
+        pos[route[p]] = p
+    dont_look = np.zeros(num_nodes, dtype=np.bool_)
+    chain = np.empty(3, dtype=route.dtype)
+
+    iteration = 0
+    total_improvements = 0
+
+    improved = True
+    while improved and iteration < max_iter:
+        improved = False
+        iteration += 1
+
+        for p in range(1, last):
+            s0 = route[p]
+            if dont_look[s0]:
+                continue
+
+            found = False
+            move_e = -1
+            move_j = -1
+            reverse = False
+            # Chains route[p..e] of 1-3 stops, never moving the start
+            for e in range(p, min(p + 3, last)):
+                s_end = route[e]
+                prev = route[p - 1]
+                nxt = route[e + 1]
+                gain = (_condensed_distance(Dc, num_nodes, prev, s0)
+                        + _condensed_distance(Dc, num_nodes, s_end, nxt)
+                        - _condensed_distance(Dc, num_nodes, prev, nxt))
+                if gain <= 1e-12:
+                    continue
+
+                for n_idx in range(neighbors.shape[1]):
+                    c = neighbors[s0, n_idx]
+                    if _condensed_distance(Dc, num_nodes, s0, c) >= gain:
+                        break
+                    if p <= pos[c] <= e:
+                        continue
+
+                    # Insert beside c: on the edge leaving it or entering it
+                    for side in range(2):
+                        j = pos[c] if side == 0 else pos[c] - 1
+                        if j < 0:
+                            j = last - 1
+                        if p - 1 <= j <= e:
+                            continue
+                        g = route[j]
+                        h = route[j + 1]
+                        d_gs0 = _condensed_distance(Dc, num_nodes, g, s0)
+                        d_send_h = _condensed_distance(Dc, num_nodes, s_end, h)
+                        d_gsend = _condensed_distance(Dc, num_nodes, g, s_end)
+                        d_s0h = _condensed_distance(Dc, num_nodes, s0, h)
+                        d_gh = _condensed_distance(Dc, num_nodes, g, h)
+                        forward = d_gs0 + d_send_h
+                        backward = d_gsend + d_s0h
+                        delta = min(forward, backward) - d_gh - gain
+                        if delta < -1e-12:
+                            found = True
+                            move_e = e
+                            move_j = j
+                            reverse = backward < forward
+                            break
+
+                    if found:
+                        break
+                if found:
+                    break
+
+            if not found:
+                dont_look[s0] = True
+                continue
+
+            _apply_or_opt(route, pos, dont_look, chain, p, move_e, move_j, reverse)
+
+            improved = True
+            total_improvements += 1
+
+    return iteration, total_improvements
+
+
+# Compile the kernels for the solver's argument types at import so the first
+# optimization doesn't pay JIT cost (one specialization serves every n)
+_warmup_route = np.array([0, 1, 2, 0], dtype=np.int32)
+_warmup_condensed = np.ones(3, dtype=np.float32)
+_warmup_neighbors = np.array([[1, 2], [0, 2], [0, 1]], dtype=np.int32)
+_two_opt_kernel(_warmup_route, _warmup_condensed, 3, _warmup_neighbors, 1, False)
+_or_opt_kernel(_warmup_route, _warmup_condensed, 3, _warmup_neighbors, 1)
@@ -4,12 +4,25 @@ High-level optimization logic with comparison utilities
 """
 
 import numpy as np
-from typing import List, Dict, Tuple
-import random
+from typing import List, Dict, Union
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
 from .tsp_solver import solve_tsp, calculate_route_distance
 from ..utils.helpers import calculate_route_metrics
+from ..utils.geocoding import locations_to_arrays
+
+
+# Routes depart at 9 AM; traffic only depends on the hour, so the date is arbitrary
+_DEFAULT_START_TIME = datetime(2000, 1, 1, 9, 0, 0)
+
+
+def _naive_route_array(num_locations: int, start_idx: int = 0) -> np.ndarray:
+    """
+    Sequential route as an int32 array: start, every other index in order, start.
+    """
+    others = np.delete(np.arange(num_locations, dtype=np.int32), start_idx)
+    return np.concatenate(([start_idx], others, [start_idx])).astype(np.int32)
 
 
 def generate_naive_route(num_locations: int, start_idx: int = 0) -> List[int]:
@@ -24,17 +37,22 @@ def generate_naive_route(num_locations: int, start_idx: int = 0) -> List[int]:
     Returns:
         Route as list of indices [0, 1, 2, 3, ..., n-1, 0]
     """
-    route = [start_idx]
-    
-    # Visit all other locations in sequential order
-    for i in range(num_locations):
-        if i != start_idx:
-            route.append(i)
+    return _naive_route_array(num_locations, start_idx).tolist()
+
+
+def naive_route_distance(distance_matrix: np.ndarray, start_idx: int = 0) -> float:
+    """
+    Total distance of the naive sequential route, without building a list.
     
-    # Return to start
-    route.append(start_idx)
+    Args:
+        distance_matrix: NxN distance matrix
+        start_idx: Starting location (warehouse)
     
-    return route
+    Returns:
+        Distance in km of [start, 0, 1, ..., n-1, start] (start visited once)
+    """
+    stops = _naive_route_array(len(distance_matrix), start_idx)
+    return float(distance_matrix[stops[:-1], stops[1:]].sum(dtype=np.float64))
 
 
 def generate_random_route(num_locations: int, start_idx: int = 0, seed: int = None) -> List[int]:
@@ -50,21 +68,15 @@ def generate_random_route(num_locations: int, start_idx: int = 0, seed: int = No
     Returns:
         Random route
     """
-    if seed is not None:
-        random.seed(seed)
-    
-    route = [start_idx]
+    rng = np.random.default_rng(seed)
     
-    # Create list of all other locations
-    other_locations = [i for i in range(num_locations) if i != start_idx]
+    # Shuffle all other locations
+    others = _naive_route_array(num_locations, start_idx)[1:-1]
+    rng.shuffle(others)
     
-    # Shuffle them
-    random.shuffle(other_locations)
+    route = np.concatenate(([start_idx], others, [start_idx]))
     
-    route.extend(other_locations)
-    route.append(start_idx)
-    
-    return route
+    return route.tolist()
 
 
 def optimize_route(
@@ -72,7 +84,8 @@ def optimize_route(
     distance_matrix: np.ndarray,
     warehouse_idx: int = 0,
     method: str = 'nn_2opt',
-    verbose: bool = False
+    verbose: bool = False,
+    start_time: datetime = None
 ) -> Dict:
     """
     Main route optimization function.
@@ -89,6 +102,7 @@ def optimize_route(
             - 'naive': Sequential order (for comparison)
             - 'random': Random order (for comparison)
         verbose: Print progress
+        start_time: Departure time for ETAs (default: 9 AM)
     
     Returns:
         Dictionary with route and comprehensive metrics
@@ -97,7 +111,7 @@ def optimize_route(
     
     if method == 'naive':
         route = generate_naive_route(num_locations, warehouse_idx)
-        distance = calculate_route_distance(route, distance_matrix)
+        distance = naive_route_distance(distance_matrix, warehouse_idx)
         
         result = {
             'route': route,
@@ -137,12 +151,14 @@ def optimize_route(
         raise ValueError(f"Unknown method: {method}")
     
     # Add detailed metrics
-    start_time = datetime.now().replace(hour=9, minute=0, second=0)
+    if start_time is None:
+        start_time = _DEFAULT_START_TIME
     metrics = calculate_route_metrics(
         result['route'],
         locations,
         distance_matrix,
-        start_time=start_time
+        start_time=start_time,
+        total_distance=result['distance']
     )
     
     result['metrics'] = metrics
@@ -179,32 +195,24 @@ def compare_routes(
         print("ROUTE COMPARISON")
         print("="*60)
     
-    # Generate all routes
-    routes = {}
-    
-    # 1. Naive route
-    if verbose:
-        print("\n1️⃣ Generating naive (sequential) route...")
-    routes['naive'] = optimize_route(
-        locations, distance_matrix, warehouse_idx, 
-        method='naive', verbose=False
-    )
-    
-    # 2. Nearest Neighbor only
-    if verbose:
-        print("2️⃣ Running Nearest Neighbor algorithm...")
-    routes['nn'] = optimize_route(
-        locations, distance_matrix, warehouse_idx,
-        method='nn', verbose=False
-    )
+    # Generate all routes. The three strategies are independent, so they
+    # run side by side; the 2-opt kernel releases the GIL while it works.
+    strategies = [
+        ('naive', 'naive', "\n1️⃣ Generating naive (sequential) route..."),
+        ('nn', 'nn', "2️⃣ Running Nearest Neighbor algorithm..."),
+        ('optimized', 'nn_2opt', "3️⃣ Running full optimization (NN + 2-Opt)..."),
+    ]
     
-    # 3. Optimized (NN + 2-Opt)
-    if verbose:
-        print("3️⃣ Running full optimization (NN + 2-Opt)...")
-    routes['optimized'] = optimize_route(
-        locations, distance_matrix, warehouse_idx,
-        method='nn_2opt', verbose=verbose
-    )
+    with ThreadPoolExecutor(max_workers=len(strategies)) as executor:
+        futures = {}
+        for key, method, message in strategies:
+            if verbose:
+                print(message)
+            futures[key] = executor.submit(
+                optimize_route, locations, distance_matrix, warehouse_idx,
+                method=method, verbose=verbose and key == 'optimized'
+            )
+        routes = {key: future.result() for key, future in futures.items()}
     
     # Calculate improvements
     naive_distance = routes['naive']['distance']
@@ -256,56 +264,47 @@ def compare_routes(
     return comparison
 
 
-def get_route_coordinates(route: List[int], locations: List[Dict]) -> List[Tuple[float, float]]:
+def get_route_coordinates(route: List[int], coords: np.ndarray) -> List[List[float]]:
     """
     Convert route indices to lat/lng coordinates.
     Useful for map visualization.
     
     Args:
         route: List of location indices
-        locations: List of location dictionaries with 'lat' and 'lng'
+        coords: Nx2 array of (lat, lng) rows, in the same order as locations
     
     Returns:
-        List of (lat, lng) tuples in route order
+        List of [lat, lng] pairs in route order
     """
-    coordinates = []
-    for idx in route:
-        loc = locations[idx]
-        coordinates.append((loc['lat'], loc['lng']))
-    
-    return coordinates
+    return coords[route].tolist()
 
 
-def get_route_details(route: List[int], locations: List[Dict]) -> List[Dict]:
+def get_route_details(
+    route: List[int],
+    locations: Union[List[Dict], Dict[str, np.ndarray]]
+) -> List[Dict]:
     """
     Get detailed information for each stop in route.
     
     Args:
         route: List of location indices
-        locations: List of location dictionaries
+        locations: List of location dictionaries, or the column arrays
+            from locations_to_arrays
     
     Returns:
         List of dictionaries with stop details
     """
-    details = []
+    columns = locations if isinstance(locations, dict) else locations_to_arrays(locations)
     
-    for position, idx in enumerate(route):
-        loc = locations[idx]
-        
-        stop_info = {
-            'position': position,
-            'id': loc['id'],
-            'name': loc['name'],
-            'address': loc['address'],
-            'locality': loc['locality'],
-            'lat': loc['lat'],
-            'lng': loc['lng'],
-            'package_count': loc.get('package_count', 0)
-        }
-        
-        details.append(stop_info)
+    # Gather each field in route order once, then zip the rows together
+    r = np.asarray(route, dtype=np.int32)
+    fields = ('id', 'name', 'address', 'locality', 'lat', 'lng', 'package_count')
+    gathered = [columns[field][r].tolist() for field in fields]
     
-    return details
+    return [
+        {'position': position, **dict(zip(fields, values))}
+        for position, values in enumerate(zip(*gathered))
+    ]
 
 
 # Test function
@@ -4,8 +4,14 @@ Implements Nearest Neighbor and 2-Opt optimization
 """
 
 import numpy as np
-from typing import List, Tuple
+from typing import Callable, List, Optional, Sequence, Tuple
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from ._tsp_numba import _two_opt_kernel, _or_opt_kernel
+except ImportError:  # numba is optional; fall back to the pure-Python loops
+    _two_opt_kernel = _or_opt_kernel = None
 
 
 def calculate_route_distance(route: List[int], distance_matrix: np.ndarray) -> float:
@@ -19,17 +25,12 @@ def calculate_route_distance(route: List[int], distance_matrix: np.ndarray) -> f
     Returns:
         Total distance in kilometers
     """
-    total_distance = 0.0
-    
-    for i in range(len(route) - 1):
-        from_idx = route[i]
-        to_idx = route[i + 1]
-        total_distance += distance_matrix[from_idx][to_idx]
-    
-    return total_distance
+    # Gather every leg in one fancy-indexing pass, summed in float64
+    r = np.asarray(route, dtype=np.int32)
+    return float(distance_matrix[r[:-1], r[1:]].sum(dtype=np.float64))
 
 
-def nearest_neighbor_tsp(distance_matrix: np.ndarray, start_idx: int = 0) -> Tuple[List[int], float]:
+def nearest_neighbor_tsp(distance_matrix: np.ndarray, start_idx: int = 0) -> Tuple[np.ndarray, float]:
     """
     Nearest Neighbor Algorithm (Greedy Heuristic)
     
@@ -48,145 +49,401 @@ def nearest_neighbor_tsp(distance_matrix: np.ndarray, start_idx: int = 0) -> Tup
     
     Returns:
         Tuple of (route, total_distance)
-        - route: List of location indices in visit order
+        - route: int32 array of location indices in visit order
         - total_distance: Total route distance in km
     
     Example:
         >>> matrix = np.array([[0, 10, 15], [10, 0, 20], [15, 20, 0]])
         >>> route, distance = nearest_neighbor_tsp(matrix, start_idx=0)
-        >>> print(route)  # [0, 1, 2, 0]
+        >>> print(route)  # [0 1 2 0]
     """
     n = len(distance_matrix)
     
     # Track which locations have been visited
-    visited = [False] * n
-    route = [start_idx]
+    visited = np.zeros(n, dtype=bool)
+    route = np.empty(n + 1, dtype=np.int32)
+    route[0] = start_idx
     visited[start_idx] = True
     
     current_idx = start_idx
     total_distance = 0.0
     
+    # One reusable buffer for the masked row (float matrices keep their dtype)
+    scratch = np.empty(n, dtype=np.result_type(distance_matrix.dtype, np.float32))
+    
     # Visit all locations
-    for _ in range(n - 1):
-        # Find nearest unvisited location
-        nearest_idx = -1
-        nearest_distance = float('inf')
-        
-        for idx in range(n):
-            if not visited[idx]:
-                dist = distance_matrix[current_idx][idx]
-                if dist < nearest_distance:
-                    nearest_distance = dist
-                    nearest_idx = idx
+    for step in range(1, n):
+        # Find nearest unvisited location with one scan of the row
+        np.copyto(scratch, distance_matrix[current_idx])
+        scratch[visited] = np.inf
+        nearest_idx = int(scratch.argmin())
         
         # Visit nearest location
-        route.append(nearest_idx)
+        route[step] = nearest_idx
         visited[nearest_idx] = True
-        total_distance += nearest_distance
+        total_distance += float(scratch[nearest_idx])
         current_idx = nearest_idx
     
     # Return to start
-    route.append(start_idx)
-    total_distance += distance_matrix[current_idx][start_idx]
+    route[n] = start_idx
+    total_distance += float(distance_matrix[current_idx][start_idx])
     
-    return route, total_distance
+    return route, float(total_distance)
 
 
-def two_opt_swap(route: List[int], i: int, k: int) -> List[int]:
+def build_neighbor_lists(distance_matrix: np.ndarray, k: int = 20) -> np.ndarray:
     """
-    Perform a 2-opt swap on a route.
+    Indices of the k nearest other locations for every location.
     
-    2-opt swap reverses the order of cities between positions i and k.
+    Args:
+        distance_matrix: NxN distance matrix
+        k: Neighbors kept per location (capped at N-1)
     
-    Example:
-        Original: [0, 1, 2, 3, 4, 5, 0]
-        i=1, k=4
-        Result:   [0, 4, 3, 2, 1, 5, 0]
+    Returns:
+        (N, k) int32 array, each row sorted nearest first
+    """
+    masked = np.array(distance_matrix, dtype=np.float32)
+    np.fill_diagonal(masked, np.inf)
+    k = max(0, min(k, len(masked) - 1))
+    return np.argsort(masked, axis=1, kind='stable')[:, :k].astype(np.int32)
+
+
+def _two_opt_python(
+    route: np.ndarray,
+    d: List[List[float]],
+    neighbor_lists: List[List[int]],
+    max_iterations: int,
+    first_improvement: bool,
+    on_improvement: Callable[[int, float], None],
+    verbose: bool
+) -> Tuple[int, int]:
+    """
+    Pure-Python neighbor-list 2-opt with don't-look bits; modifies route in place.
+    
+    Mirrors _two_opt_kernel move for move. on_improvement(iteration, delta)
+    is called after every applied swap.
+    
+    Returns:
+        Tuple of (iterations, total_improvements)
+    """
+    # Edge k joins route[k] and route[k + 1]
+    last = len(route) - 1
+    pos = [0] * len(d)
+    for p in range(last):
+        pos[route[p]] = p
+    dont_look = [False] * len(d)
+    
+    def apply_swap(k1, k2):
+        # Moving these four endpoints may open new moves around them
+        for node in route[[k1, k1 + 1, k2, k2 + 1]]:
+            dont_look[node] = False
+        lo, hi = min(k1, k2) + 1, max(k1, k2)
+        route[lo:hi + 1] = route[lo:hi + 1][::-1]
+        for j in range(lo, hi + 1):
+            pos[route[j]] = j
+    
+    iteration = 0
+    total_improvements = 0
+    
+    improved = True
+    
+    while improved and iteration < max_iterations:
+        improved = False
+        iteration += 1
+        best_move, best_delta = None, -1e-12
+        
+        for p in range(last):
+            a = route[p]
+            if dont_look[a]:
+                continue
+            
+            found = False
+            # Try a's outgoing edge, then its incoming one
+            for outgoing in (True, False):
+                k1 = pos[a] if outgoing else (pos[a] - 1) % last
+                x, y = route[k1], route[k1 + 1]
+                removed = d[x][y]
+                
+                for c in neighbor_lists[a]:
+                    # Sorted neighbors: once a-c is no shorter than the
+                    # edge it would replace, no later c can help
+                    if d[a][c] >= removed:
+                        break
+                    
+                    # Swapping edges (x,y) and (u,v) for (x,u) and (y,v)
+                    # is an O(1) change (distances are symmetric)
+                    k2 = pos[c] if outgoing else (pos[c] - 1) % last
+                    u, v = route[k2], route[k2 + 1]
+                    delta = d[x][u] + d[y][v] - removed - d[u][v]
+                    
+                    if delta < -1e-12:
+                        found = True
+                        # First-continue: apply the swap in place now
+                        if first_improvement:
+                            apply_swap(k1, k2)
+                            on_improvement(iteration, delta)
+                            break
+                        if delta < best_delta:
+                            best_move, best_delta = (k1, k2), delta
+                
+                if found and first_improvement:
+                    break
+            
+            if not found:
+                dont_look[a] = True
+            elif first_improvement:
+                improved = True
+                total_improvements += 1
+        
+        # Best: apply the single best swap of the pass
+        if best_move is not None:
+            apply_swap(*best_move)
+            on_improvement(iteration, best_delta)
+            improved = True
+            total_improvements += 1
+        
+        if not improved and verbose:
+            print(f"Iteration {iteration}: No improvement found. Converged!")
+    
+    return iteration, total_improvements
+
+
+def _or_opt_python(
+    route: np.ndarray,
+    d: List[List[float]],
+    neighbor_lists: List[List[int]],
+    max_iterations: int,
+    on_improvement: Callable[[int, float], None]
+) -> Tuple[int, int]:
+    """
+    Pure-Python Or-opt with don't-look bits; modifies route in place.
+    
+    Mirrors _or_opt_kernel move for move. on_improvement(iteration, delta)
+    is called after every applied move.
+    
+    Returns:
+        Tuple of (iterations, total_improvements)
+    """
+    last = len(route) - 1
+    pos = [0] * len(d)
+    for p in range(last):
+        pos[route[p]] = p
+    dont_look = [False] * len(d)
+    
+    iteration = 0
+    total_improvements = 0
+    
+    improved = True
+    
+    while improved and iteration < max_iterations:
+        improved = False
+        iteration += 1
         
-    This "uncrosses" the route if edges were crossing.
+        for p in range(1, last):
+            s0 = route[p]
+            if dont_look[s0]:
+                continue
+            
+            move = None
+            # Chains route[p..e] of 1-3 stops, never moving the start
+            for e in range(p, min(p + 3, last)):
+                s_end = route[e]
+                prev, nxt = route[p - 1], route[e + 1]
+                gain = d[prev][s0] + d[s_end][nxt] - d[prev][nxt]
+                if gain <= 1e-12:
+                    continue
+                
+                for c in neighbor_lists[s0]:
+                    if d[s0][c] >= gain:
+                        break
+                    if p <= pos[c] <= e:
+                        continue
+                    
+                    # Insert beside c: on the edge leaving it or entering it
+                    for j in (pos[c], (pos[c] - 1) % last):
+                        if p - 1 <= j <= e:
+                            continue
+                        g, h = route[j], route[j + 1]
+                        forward = d[g][s0] + d[s_end][h]
+                        backward = d[g][s_end] + d[s0][h]
+                        delta = min(forward, backward) - d[g][h] - gain
+                        if delta < -1e-12:
+                            move = (e, j, backward < forward, delta)
+                            break
+                    
+                    if move:
+                        break
+                if move:
+                    break
+            
+            if move is None:
+                dont_look[s0] = True
+                continue
+            
+            e, j, reverse, delta = move
+            for node in (route[p - 1], route[e + 1], route[j], route[j + 1]):
+                dont_look[node] = False
+            
+            # Cut the chain out and splice it in after route[j]
+            chain = route[p:e + 1].copy()
+            if reverse:
+                chain = chain[::-1]
+            length = e - p + 1
+            if j < p:
+                route[j + 1 + length:e + 1] = route[j + 1:p].copy()
+                route[j + 1:j + 1 + length] = chain
+                changed = range(j + 1, e + 1)
+            else:
+                route[p:j + 1 - length] = route[e + 1:j + 1].copy()
+                route[j + 1 - length:j + 1] = chain
+                changed = range(p, j + 1)
+            for q in changed:
+                pos[route[q]] = q
+            
+            improved = True
+            total_improvements += 1
+            on_improvement(iteration, delta)
+    
+    return iteration, total_improvements
+
+
+def condensed_distance_matrix(distance_matrix: np.ndarray) -> np.ndarray:
+    """
+    Upper triangle of a symmetric distance matrix as a flat float32 array.
+    
+    Row-major over i < j (scipy squareform order), the layout the compiled
+    2-opt and Or-opt kernels read: half the bytes of the full matrix.
     
     Args:
-        route: Current route
-        i: Start position for reversal
-        k: End position for reversal
+        distance_matrix: NxN symmetric distance matrix
     
     Returns:
-        New route with segment reversed
+        Array of N(N-1)/2 distances
     """
-    # Keep start, reverse middle segment, keep end
-    new_route = route[:i] + route[i:k+1][::-1] + route[k+1:]
-    return new_route
+    num_nodes = len(distance_matrix)
+    return np.asarray(distance_matrix, dtype=np.float32)[np.triu_indices(num_nodes, 1)]
 
 
 def two_opt_optimization(
-    route: List[int], 
+    route: Sequence[int], 
     distance_matrix: np.ndarray,
     max_iterations: int = 1000,
-    verbose: bool = False
-) -> Tuple[List[int], float, dict]:
+    verbose: bool = False,
+    neighbors: Optional[np.ndarray] = None,
+    strategy: str = 'first-continue',
+    or_opt: bool = True,
+    condensed: Optional[np.ndarray] = None
+) -> Tuple[np.ndarray, float, dict]:
     """
     2-Opt Local Search Optimization
     
     Algorithm:
     1. Start with initial route (from Nearest Neighbor)
-    2. For each pair of edges in route:
-        a. Try swapping them (uncrossing)
+    2. For each location on the route:
+        a. Try swapping one of its edges for an edge to a close neighbor
         b. If swap reduces distance, keep it
+        c. If nothing helps, mark it "don't look" until a neighbor moves
     3. Repeat until no improvement found
+    4. Or-opt: try moving chains of 1-3 stops next to a close neighbor
+       (either way round); if any move helps, go back to step 2
     
-    Time Complexity: O(n² × iterations)
+    Time Complexity: O(n × k × iterations), each swap evaluated in O(1)
     Typical iterations: 10-50
     
     Why It Works:
     - Eliminates "crossing" edges
     - Each swap improves route (or keeps it same)
+    - Improving swaps almost always join near neighbors (Bentley),
+      so only the k nearest need checking
+    - Or-opt moves reach tours that no single 2-opt swap can
     - Converges to local optimum
     
+    Strategies:
+    - 'first-continue': apply each improving swap as soon as it is found
+      and keep scanning the same pass. Few passes; the usual choice.
+    - 'best': scan the whole pass, then apply only the single best swap.
+      One swap per pass, so many more passes (max_iterations caps the
+      number of swaps); sometimes lands in a slightly better optimum.
+    
     Args:
         route: Initial route from nearest neighbor
         distance_matrix: Distance matrix
         max_iterations: Maximum number of improvement passes
         verbose: Print progress
+        neighbors: Neighbor lists from build_neighbor_lists (built if omitted)
+        strategy: 'first-continue' or 'best' (see above)
+        or_opt: Alternate with Or-opt moves once 2-opt converges
+        condensed: Upper triangle from condensed_distance_matrix (built if
+            omitted); pass it when optimizing several routes on one matrix
     
     Returns:
-        Tuple of (optimized_route, distance, stats)
+        Tuple of (optimized_route, distance, stats), the route as an int32 array
     """
-    n = len(route)
-    best_route = route.copy()
-    best_distance = calculate_route_distance(best_route, distance_matrix)
+    if strategy not in ('first-continue', 'best'):
+        raise ValueError(f"Unknown strategy: {strategy}")
+    first_improvement = strategy == 'first-continue'
     
+    best_route = np.array(route, dtype=np.int32)
+    best_distance = calculate_route_distance(best_route, distance_matrix)
     initial_distance = best_distance
-    iteration = 0
-    total_improvements = 0
     
-    improved = True
+    if neighbors is None:
+        neighbors = build_neighbor_lists(distance_matrix)
     
-    while improved and iteration < max_iterations:
-        improved = False
-        iteration += 1
+    # Compiled path: same search, no per-move progress output
+    if _two_opt_kernel is not None and not verbose:
+        num_nodes = len(distance_matrix)
+        if condensed is None:
+            condensed = condensed_distance_matrix(distance_matrix)
+        neighbors = np.ascontiguousarray(neighbors, dtype=np.int32)
         
-        # Try all possible 2-opt swaps
-        for i in range(1, n - 2):
-            for k in range(i + 1, n - 1):
-                # Create new route with this swap
-                new_route = two_opt_swap(best_route, i, k)
-                new_distance = calculate_route_distance(new_route, distance_matrix)
-                
-                # If improvement found, keep it
-                if new_distance < best_distance:
-                    best_route = new_route
-                    best_distance = new_distance
-                    improved = True
-                    total_improvements += 1
-                    
-                    if verbose:
-                        improvement_pct = ((initial_distance - best_distance) / initial_distance) * 100
-                        print(f"Iteration {iteration}: Found improvement! "
-                              f"Distance: {best_distance:.2f} km "
-                              f"({improvement_pct:.1f}% better than initial)")
+        def run_two_opt():
+            return _two_opt_kernel(
+                best_route, condensed, num_nodes, neighbors,
+                max_iterations, not first_improvement
+            )
         
-        if not improved and verbose:
-            print(f"Iteration {iteration}: No improvement found. Converged!")
+        def run_or_opt():
+            return _or_opt_kernel(best_route, condensed, num_nodes, neighbors, max_iterations)
+    else:
+        # Plain nested lists: Python-level element access is much cheaper
+        # than indexing the NumPy matrix one scalar at a time
+        d = np.asarray(distance_matrix, dtype=float).tolist()
+        neighbor_lists = np.asarray(neighbors).tolist()
+        
+        def on_improvement(iteration, delta):
+            nonlocal best_distance
+            best_distance += delta
+            if verbose:
+                improvement_pct = ((initial_distance - best_distance) / initial_distance) * 100
+                print(f"Iteration {iteration}: Found improvement! "
+                      f"Distance: {best_distance:.2f} km "
+                      f"({improvement_pct:.1f}% better than initial)")
+        
+        def run_two_opt():
+            return _two_opt_python(
+                best_route, d, neighbor_lists, max_iterations,
+                first_improvement, on_improvement, verbose
+            )
+        
+        def run_or_opt():
+            return _or_opt_python(best_route, d, neighbor_lists, max_iterations, on_improvement)
+    
+    iteration, total_improvements = run_two_opt()
+    or_opt_improvements = 0
+    
+    # A relocated chain can open new 2-opt swaps, so alternate until neither helps
+    while or_opt:
+        _, moved = run_or_opt()
+        if not moved:
+            break
+        or_opt_improvements += moved
+        passes, swaps = run_two_opt()
+        iteration += passes
+        total_improvements += swaps
+    
+    # Re-sum the final route so the reported distance has no accumulated drift
+    best_distance = calculate_route_distance(best_route, distance_matrix)
     
     # Calculate statistics
     improvement_pct = ((initial_distance - best_distance) / initial_distance) * 100
@@ -197,28 +454,62 @@ def two_opt_optimization(
         'improvement_km': initial_distance - best_distance,
         'improvement_pct': improvement_pct,
         'iterations': iteration,
-        'total_improvements': total_improvements
+        'total_improvements': total_improvements,
+        'or_opt_improvements': or_opt_improvements
     }
     
     return best_route, best_distance, stats
 
 
+def _multi_start_indices(n: int, start_idx: int, num_starts: int) -> List[int]:
+    """
+    start_idx followed by up to num_starts - 1 other locations spread evenly over the indices.
+    """
+    others = np.delete(np.arange(n), start_idx)
+    count = min(max(num_starts, 1) - 1, len(others))
+    if count == 0:
+        return [start_idx]
+    picks = others[np.linspace(0, len(others) - 1, count).astype(int)]
+    return [start_idx] + picks.tolist()
+
+
+def _rotate_to_start(route: np.ndarray, start_idx: int) -> np.ndarray:
+    """
+    Rotate a closed route so it begins and ends at start_idx (same edges, same length).
+    """
+    tour = route[:-1]
+    shift = int(np.flatnonzero(tour == start_idx)[0])
+    return np.append(np.roll(tour, -shift), start_idx).astype(np.int32)
+
+
 def solve_tsp(
     distance_matrix: np.ndarray,
     start_idx: int = 0,
     optimize: bool = True,
-    verbose: bool = False
+    verbose: bool = False,
+    num_neighbors: int = 20,
+    strategy: str = 'first-continue',
+    num_starts: int = 1,
+    or_opt: bool = True
 ) -> dict:
     """
     Complete TSP solver combining Nearest Neighbor + 2-Opt.
     
     This is the main function to call for route optimization.
     
+    Nearest Neighbor depends heavily on where it starts. With num_starts > 1
+    it also runs from other locations (tours rotated back to start_idx),
+    optimizes every tour side by side, and keeps the shortest.
+    
     Args:
         distance_matrix: NxN distance matrix
         start_idx: Starting location (warehouse)
         optimize: Whether to run 2-Opt optimization
         verbose: Print progress
+        num_neighbors: Candidate neighbors per location in 2-Opt
+        strategy: 2-Opt move strategy, 'first-continue' or 'best'
+        num_starts: Number of Nearest Neighbor starting locations to try
+        or_opt: Alternate 2-Opt with Or-opt chain moves
     
     Returns:
         Dictionary with:
@@ -233,15 +524,26 @@ def solve_tsp(
         'timing': {}
     }
     
+    # float32 is ample for km distances and halves the matrix's cache footprint
+    distance_matrix = np.ascontiguousarray(distance_matrix, dtype=np.float32)
+    starts = _multi_start_indices(len(distance_matrix), start_idx, num_starts)
+    results['num_starts'] = len(starts)
+    
     # Phase 1: Nearest Neighbor
     if verbose:
         print("🔍 Running Nearest Neighbor algorithm...")
     
     start_time = time.time()
-    nn_route, nn_distance = nearest_neighbor_tsp(distance_matrix, start_idx)
+    nn_runs = []
+    for s in starts:
+        route, distance = nearest_neighbor_tsp(distance_matrix, s)
+        if s != start_idx:
+            route = _rotate_to_start(route, start_idx)
+        nn_runs.append((route, distance))
+    nn_route, nn_distance = min(nn_runs, key=lambda run: run[1])
     nn_time = time.time() - start_time
     
-    results['nn_route'] = nn_route
+    results['nn_route'] = nn_route.tolist()
     results['nn_distance'] = nn_distance
     results['timing']['nearest_neighbor'] = nn_time
     
@@ -256,14 +558,33 @@ def solve_tsp(
             print("🔧 Running 2-Opt optimization...")
         
         start_time = time.time()
-        opt_route, opt_distance, opt_stats = two_opt_optimization(
-            nn_route, 
-            distance_matrix,
-            verbose=verbose
-        )
+        neighbors = build_neighbor_lists(distance_matrix, num_neighbors)
+        # Shared by every start; only the compiled path reads it
+        condensed = None
+        if _two_opt_kernel is not None and not verbose:
+            condensed = condensed_distance_matrix(distance_matrix)
+        
+        def optimize_start(route):
+            return two_opt_optimization(
+                route, 
+                distance_matrix,
+                verbose=verbose,
+                neighbors=neighbors,
+                strategy=strategy,
+                or_opt=or_opt,
+                condensed=condensed
+            )
+        
+        if len(nn_runs) == 1:
+            opt_runs = [optimize_start(nn_route)]
+        else:
+            # The 2-opt kernel releases the GIL, so threads run in parallel
+            with ThreadPoolExecutor(max_workers=len(nn_runs)) as executor:
+                opt_runs = list(executor.map(optimize_start, [route for route, _ in nn_runs]))
+        opt_route, opt_distance, opt_stats = min(opt_runs, key=lambda run: run[1])
         opt_time = time.time() - start_time
         
-        results['route'] = opt_route
+        results['route'] = opt_route.tolist()
         results['distance'] = opt_distance
         results['optimization_stats'] = opt_stats
         results['timing']['two_opt'] = opt_time
@@ -273,7 +594,7 @@ def solve_tsp(
             print(f"✅ 2-Opt complete: {opt_distance:.2f} km in {opt_time:.3f}s")
             print(f"📊 Overall improvement: {opt_stats['improvement_pct']:.1f}%")
     else:
-        results['route'] = nn_route
+        results['route'] = nn_route.tolist()
         results['distance'] = nn_distance
         results['timing']['total'] = nn_time
     
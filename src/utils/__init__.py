@@ -4,27 +4,32 @@ Utility functions for route optimization
 
 from .helpers import (
     haversine_distance,
+    haversine_to_point,
     calculate_distance_matrix,
     calculate_total_distance,
     estimate_travel_time,
     format_time,
     calculate_fuel_cost,
     calculate_route_metrics,
-    calculate_co2_emissions
+    calculate_co2_emissions,
+    calculate_trip_costs
 )
 
 from .geocoding import (
     load_addresses,
     load_warehouse,
     addresses_to_locations,
+    locations_to_arrays,
     get_locality_summary,
     validate_coordinates,
+    validate_coordinates_array,
     get_bounding_box
 )
 
 __all__ = [
     # Distance functions
     'haversine_distance',
+    'haversine_to_point',
     'calculate_distance_matrix',
     'calculate_total_distance',
     'estimate_travel_time',
@@ -36,12 +41,15 @@ __all__ = [
     'calculate_fuel_cost',
     'calculate_co2_emissions',
     'calculate_route_metrics',
+    'calculate_trip_costs',
     
     # Data loading
     'load_addresses',
     'load_warehouse',
     'addresses_to_locations',
+    'locations_to_arrays',
     'get_locality_summary',
     'validate_coordinates',
+    'validate_coordinates_array',
     'get_bounding_box'
 ]
\ No newline at end of file
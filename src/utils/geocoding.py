@@ -6,16 +6,76 @@ Handles CSV loading, data validation, and coordinate processing
 import pandas as pd
 import json
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 import numpy as np
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    orjson = None
 
-def load_addresses(csv_path: str = "data/hyderabad_addresses.csv") -> pd.DataFrame:
+
+# Default Hyderabad bounds (approximate)
+HYDERABAD_BOUNDS = {
+    'lat_min': 17.2,
+    'lat_max': 17.6,
+    'lng_min': 78.2,
+    'lng_max': 78.6
+}
+
+
+def _clean_addresses(df: pd.DataFrame, coerce_numeric: bool) -> pd.DataFrame:
+    """
+    Coerce numeric columns and drop rows without valid coordinates.
+    """
+    if coerce_numeric:
+        for col in ['lat', 'lng', 'package_count']:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    df['package_count'] = df['package_count'].fillna(1).astype('int16')
+    
+    # Remove any rows with missing or out-of-bounds coordinates (NaN fails
+    # every comparison, so one mask covers both)
+    return df[validate_coordinates_array(df['lat'].to_numpy(), df['lng'].to_numpy())]
+
+
+def _read_addresses(csv_path: Path, dtypes: Dict, chunksize: Optional[int],
+                    coerce_numeric: bool) -> pd.DataFrame:
+    """
+    Read and clean the address CSV, whole or chunk by chunk.
+    """
+    read_kwargs = dict(
+        dtype=dtypes,
+        usecols=lambda col: col in dtypes,
+        engine='c'
+    )
+    
+    if chunksize is None:
+        return _clean_addresses(pd.read_csv(csv_path, **read_kwargs), coerce_numeric)
+    
+    # Each chunk is cleaned as it arrives, so dropped rows never pile up
+    frames = [
+        _clean_addresses(chunk, coerce_numeric)
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize, **read_kwargs)
+    ]
+    if not frames:
+        return _clean_addresses(pd.read_csv(csv_path, **read_kwargs), coerce_numeric)
+    
+    df = pd.concat(frames)
+    # Chunks see different localities, and concat falls back to object dtype
+    if df['locality'].dtype != 'category':
+        df['locality'] = df['locality'].astype('category')
+    return df
+
+
+def load_addresses(csv_path: str = "data/hyderabad_addresses.csv",
+                   chunksize: Optional[int] = None) -> pd.DataFrame:
     """
     Load delivery addresses from CSV file.
     
     Args:
         csv_path: Path to CSV file
+        chunksize: Optional number of rows to parse and clean at a time,
+            keeping peak memory bounded for large files
     
     Returns:
         DataFrame with address data
@@ -29,22 +89,36 @@ def load_addresses(csv_path: str = "data/hyderabad_addresses.csv") -> pd.DataFra
     if not csv_path.exists():
         raise FileNotFoundError(f"Address file not found: {csv_path}")
     
-    df = pd.read_csv(csv_path)
-    
-    # Validate required columns
     required_columns = ['id', 'customer_name', 'address', 'lat', 'lng', 'locality', 'package_count']
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    numeric_columns = ['lat', 'lng', 'package_count']
+    
+    # Validate required columns from the header alone
+    header = pd.read_csv(csv_path, nrows=0).columns
+    missing_columns = [col for col in required_columns if col not in header]
     
     if missing_columns:
         raise ValueError(f"Missing required columns: {missing_columns}")
     
-    # Validate data types
-    df['lat'] = pd.to_numeric(df['lat'], errors='coerce')
-    df['lng'] = pd.to_numeric(df['lng'], errors='coerce')
-    df['package_count'] = pd.to_numeric(df['package_count'], errors='coerce').fillna(1).astype(int)
+    # Explicit dtypes let the C parser build typed columns in one pass,
+    # and only the columns we use are parsed
+    dtypes = {
+        'id': 'int32',
+        'customer_name': 'string',
+        'address': 'string',
+        'lat': 'float64',
+        'lng': 'float64',
+        'locality': 'category',
+        'package_count': 'Int16'
+    }
     
-    # Remove any rows with invalid coordinates
-    df = df.dropna(subset=['lat', 'lng'])
+    try:
+        df = _read_addresses(csv_path, dtypes, chunksize, coerce_numeric=False)
+    except ValueError:
+        # A malformed numeric cell: read those columns as text and coerce
+        # so bad values become NaN instead of failing the load
+        text_dtypes = {col: 'object' if col in numeric_columns else dtype
+                       for col, dtype in dtypes.items()}
+        df = _read_addresses(csv_path, text_dtypes, chunksize, coerce_numeric=True)
     
     if len(df) == 0:
         raise ValueError("No valid addresses found in CSV")
@@ -72,8 +146,13 @@ def load_warehouse(json_path: str = "data/warehouse.json") -> Dict:
     if not json_path.exists():
         raise FileNotFoundError(f"Warehouse file not found: {json_path}")
     
-    with open(json_path, 'r') as f:
-        warehouse = json.load(f)
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers
+    # see the same exception either way
+    if orjson is not None:
+        warehouse = orjson.loads(json_path.read_bytes())
+    else:
+        with open(json_path, 'r') as f:
+            warehouse = json.load(f)
     
     # Validate required fields
     required_fields = ['name', 'address', 'lat', 'lng']
@@ -96,21 +175,53 @@ def addresses_to_locations(df: pd.DataFrame) -> List[Dict]:
     Returns:
         List of location dicts with standardized format
     """
-    locations = []
-    
-    for _, row in df.iterrows():
-        location = {
-            'id': int(row['id']),
-            'name': str(row['customer_name']),
-            'address': str(row['address']),
-            'lat': float(row['lat']),
-            'lng': float(row['lng']),
-            'locality': str(row['locality']),
-            'package_count': int(row['package_count'])
-        }
-        locations.append(location)
-    
-    return locations
+    # Categorical localities: one str() per category instead of per row,
+    # then map codes back (code -1 is a missing value and stays NaN, as
+    # astype(str) leaves it)
+    locality = df['locality']
+    if isinstance(locality.dtype, pd.CategoricalDtype):
+        names = locality.cat.categories.astype(str).tolist() + [np.nan]
+        localities = [names[code] for code in locality.cat.codes.tolist()]
+    else:
+        localities = locality.astype(str).tolist()
+    
+    # Pull each column out once (tolist() yields native Python values)
+    # instead of boxing a Series per row with iterrows()
+    columns = {
+        'id': df['id'].astype(int).tolist(),
+        'name': df['customer_name'].astype(str).tolist(),
+        'address': df['address'].astype(str).tolist(),
+        'lat': df['lat'].astype(float).tolist(),
+        'lng': df['lng'].astype(float).tolist(),
+        'locality': localities,
+        'package_count': df['package_count'].astype(int).tolist()
+    }
+    
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+def locations_to_arrays(locations: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Convert a list of location dicts into column arrays (structure-of-arrays).
+    
+    Vectorized consumers (map markers, route details) work on one contiguous
+    array per field instead of looking up keys in every dict.
+    
+    Args:
+        locations: List of location dicts
+    
+    Returns:
+        Dict mapping each field name to a NumPy array in location order
+    """
+    return {
+        'id': np.array([loc['id'] for loc in locations], dtype=int),
+        'name': np.array([loc['name'] for loc in locations], dtype=object),
+        'address': np.array([loc['address'] for loc in locations], dtype=object),
+        'lat': np.array([loc['lat'] for loc in locations], dtype=float),
+        'lng': np.array([loc['lng'] for loc in locations], dtype=float),
+        'locality': np.array([loc['locality'] for loc in locations], dtype=object),
+        'package_count': np.array([loc.get('package_count', 0) for loc in locations], dtype=int)
+    }
 
 
 def get_locality_summary(df: pd.DataFrame) -> pd.DataFrame:
@@ -123,7 +234,7 @@ def get_locality_summary(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         Summary DataFrame with counts and package totals by locality
     """
-    summary = df.groupby('locality').agg({
+    summary = df.groupby('locality', observed=True).agg({
         'id': 'count',
         'package_count': 'sum'
     }).rename(columns={
@@ -148,17 +259,15 @@ def validate_coordinates(lat: float, lng: float,
     Returns:
         True if coordinates are valid and within bounds
     """
-    # Default Hyderabad bounds (approximate)
     if hyderabad_bounds is None:
-        hyderabad_bounds = {
-            'lat_min': 17.2,
-            'lat_max': 17.6,
-            'lng_min': 78.2,
-            'lng_max': 78.6
-        }
-    
-    # Check if coordinates are valid numbers
-    if not isinstance(lat, (int, float)) or not isinstance(lng, (int, float)):
+        hyderabad_bounds = HYDERABAD_BOUNDS
+    
+    # Check if coordinates are valid numbers (NumPy scalars and Decimal
+    # included); NaN then fails the range checks below
+    try:
+        lat = float(lat)
+        lng = float(lng)
+    except (TypeError, ValueError):
         return False
     
     # Check if within bounds
@@ -171,6 +280,29 @@ def validate_coordinates(lat: float, lng: float,
     return True
 
 
+def validate_coordinates_array(lats: np.ndarray, lngs: np.ndarray,
+                               hyderabad_bounds: Dict = None) -> np.ndarray:
+    """
+    Array version of validate_coordinates: one mask for many points.
+    
+    Args:
+        lats: Latitudes
+        lngs: Longitudes
+        hyderabad_bounds: Optional custom bounds
+    
+    Returns:
+        Boolean array, True where the point is within bounds (NaN is False)
+    """
+    if hyderabad_bounds is None:
+        hyderabad_bounds = HYDERABAD_BOUNDS
+    
+    lats = np.asarray(lats, dtype=float)
+    lngs = np.asarray(lngs, dtype=float)
+    
+    return ((lats >= hyderabad_bounds['lat_min']) & (lats <= hyderabad_bounds['lat_max'])
+            & (lngs >= hyderabad_bounds['lng_min']) & (lngs <= hyderabad_bounds['lng_max']))
+
+
 def get_bounding_box(locations: List[Dict]) -> Dict:
     """
     Calculate bounding box for a list of locations.
@@ -182,16 +314,17 @@ def get_bounding_box(locations: List[Dict]) -> Dict:
     Returns:
         Dict with min/max lat/lng and center point
     """
-    lats = [loc['lat'] for loc in locations]
-    lngs = [loc['lng'] for loc in locations]
+    # Only the two coordinate columns are needed for min/max/mean
+    lats = np.fromiter((loc['lat'] for loc in locations), float, len(locations))
+    lngs = np.fromiter((loc['lng'] for loc in locations), float, len(locations))
     
     return {
-        'lat_min': min(lats),
-        'lat_max': max(lats),
-        'lng_min': min(lngs),
-        'lng_max': max(lngs),
-        'center_lat': sum(lats) / len(lats),
-        'center_lng': sum(lngs) / len(lngs)
+        'lat_min': float(lats.min()),
+        'lat_max': float(lats.max()),
+        'lng_min': float(lngs.min()),
+        'lng_max': float(lngs.max()),
+        'center_lat': float(lats.mean()),
+        'center_lng': float(lngs.mean())
     }
 
 
@@ -206,7 +339,15 @@ def filter_by_locality(df: pd.DataFrame, localities: List[str]) -> pd.DataFrame:
     Returns:
         Filtered DataFrame
     """
-    return df[df['locality'].isin(localities)]
+    locality = df['locality']
+    if not isinstance(locality.dtype, pd.CategoricalDtype):
+        return df[locality.isin(localities)]
+    
+    # Compare the integer codes instead of hashing each row's string;
+    # unknown names map to -1, which is also the code for missing values
+    target_codes = locality.cat.categories.get_indexer(localities)
+    target_codes = target_codes[target_codes >= 0]
+    return df[np.isin(locality.cat.codes.to_numpy(), target_codes)]
 
 
 def get_distance_statistics(df: pd.DataFrame, warehouse: Dict) -> Dict:
@@ -220,20 +361,18 @@ def get_distance_statistics(df: pd.DataFrame, warehouse: Dict) -> Dict:
     Returns:
         Dictionary with distance statistics
     """
-    from .helpers import haversine_distance
+    from .helpers import haversine_to_point
     
-    distances = []
-    for _, row in df.iterrows():
-        dist = haversine_distance(
-            warehouse['lat'], warehouse['lng'],
-            row['lat'], row['lng']
-        )
-        distances.append(dist)
+    # Warehouse-to-address distances only: one length-N vector, no NxN matrix
+    distances = haversine_to_point(
+        df['lat'].to_numpy(), df['lng'].to_numpy(),
+        warehouse['lat'], warehouse['lng']
+    )
     
     return {
-        'min_distance_km': round(min(distances), 2),
-        'max_distance_km': round(max(distances), 2),
-        'avg_distance_km': round(sum(distances) / len(distances), 2),
+        'min_distance_km': round(float(distances.min()), 2),
+        'max_distance_km': round(float(distances.max()), 2),
+        'avg_distance_km': round(float(distances.mean()), 2),
         'total_addresses': len(distances)
     }
 
@@ -4,57 +4,184 @@ Includes distance calculations, time estimation, and helpers
 """
 
 import numpy as np
-from typing import Tuple, List, Dict
+from typing import Tuple, List, Dict, Optional
 from datetime import datetime, timedelta
+from pathlib import Path
+import hashlib
 import math
+import os
+import tempfile
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba is optional; fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+    NUMBA_AVAILABLE = False
 
-def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+
+# Earth's radius in kilometers
+EARTH_RADIUS_KM = 6371.0
+
+# Degrees to radians (pi / 180), folded so conversions are a single multiply
+_DEG2RAD = 0.017453292519943295
+
+# Average city speed in Hyderabad, and how much slower each traffic condition is
+BASE_SPEED_KMPH = 35
+TRAFFIC_MULTIPLIERS = {
+    'morning_rush': 1.4,   # 6-9 AM
+    'evening_rush': 1.5,   # 5-8 PM
+    'normal': 1.0,         # 9 AM - 5 PM
+    'night': 0.9           # 8 PM - 6 AM
+}
+
+# Traffic condition for each hour of the day (index 0-23), as a position in
+# _TRAFFIC_CONDITIONS, so lookups are one array index instead of range checks
+_TRAFFIC_CONDITIONS = ('morning_rush', 'evening_rush', 'normal', 'night')
+_HOUR_CONDITION = np.array([3] * 6 + [0] * 3 + [2] * 8 + [1] * 3 + [3] * 4, dtype=np.int8)
+_CONDITION_MULTIPLIER = np.array([TRAFFIC_MULTIPLIERS[c] for c in _TRAFFIC_CONDITIONS])
+
+# Distance matrices already computed in this process, keyed on a digest of
+# the coordinates (oldest entry evicted first)
+_MATRIX_CACHE: Dict[bytes, np.ndarray] = {}
+_MATRIX_CACHE_SIZE = 8
+
+
+@njit(cache=True, fastmath=True)
+def _haversine_scalar(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    Scalar Haversine kernel using the math module (JIT-compiled when numba is available).
+    """
+    lat1_rad = lat1 * _DEG2RAD
+    lat2_rad = lat2 * _DEG2RAD
+    dlat = lat2_rad - lat1_rad
+    dlng = (lng2 - lng1) * _DEG2RAD
+    
+    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlng / 2)**2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _haversine_vectorized(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """
+    Haversine formula over NumPy arrays (inputs broadcast against each other).
+    """
+    lat1_rad = np.radians(lat1)
+    lat2_rad = np.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlng = np.radians(lng2) - np.radians(lng1)
+    
+    a = np.sin(dlat / 2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlng / 2)**2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def haversine_distance(lat1, lng1, lat2, lng2):
     """
     Calculate the great circle distance between two points on Earth.
     Uses the Haversine formula.
     
+    Scalar inputs go through the JIT-compiled kernel; array inputs are
+    broadcast through the vectorized NumPy path.
+    
     Args:
         lat1, lng1: Coordinates of first point (degrees)
         lat2, lng2: Coordinates of second point (degrees)
     
     Returns:
-        Distance in kilometers
+        Distance in kilometers (float, or ndarray for array inputs)
     
     Example:
         >>> distance = haversine_distance(17.4485, 78.3908, 17.4400, 78.3811)
         >>> print(f"{distance:.2f} km")  # ~1.12 km
     """
-    # Earth's radius in kilometers
-    R = 6371.0
+    if np.ndim(lat1) or np.ndim(lng1) or np.ndim(lat2) or np.ndim(lng2):
+        return _haversine_vectorized(lat1, lng1, lat2, lng2)
     
-    # Convert degrees to radians
-    lat1_rad = math.radians(lat1)
-    lng1_rad = math.radians(lng1)
-    lat2_rad = math.radians(lat2)
-    lng2_rad = math.radians(lng2)
+    return _haversine_scalar(float(lat1), float(lng1), float(lat2), float(lng2))
+
+
+def haversine_to_point(lats: np.ndarray, lngs: np.ndarray,
+                       point_lat: float, point_lng: float) -> np.ndarray:
+    """
+    Distances from many locations to a single point (e.g. the warehouse).
     
-    # Differences
-    dlat = lat2_rad - lat1_rad
-    dlng = lng2_rad - lng1_rad
+    O(N) alternative to building the full distance matrix when only one
+    row of it is needed.
     
-    # Haversine formula
-    a = math.sin(dlat / 2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlng / 2)**2
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    Args:
+        lats, lngs: Arrays of coordinates (degrees)
+        point_lat, point_lng: Coordinates of the reference point (degrees)
     
-    distance = R * c
-    return distance
+    Returns:
+        Array of distances in kilometers, same length as lats
+    """
+    return _haversine_vectorized(
+        point_lat, point_lng,
+        np.asarray(lats, dtype=float), np.asarray(lngs, dtype=float)
+    )
+
+
+def _remember_matrix(key: bytes, distance_matrix: np.ndarray) -> None:
+    """
+    Add a read-only matrix to the in-process memo, evicting the oldest entry.
+    """
+    if len(_MATRIX_CACHE) >= _MATRIX_CACHE_SIZE:
+        del _MATRIX_CACHE[next(iter(_MATRIX_CACHE))]
+    _MATRIX_CACHE[key] = distance_matrix
+
+
+def _save_matrix(cache_path: Path, distance_matrix: np.ndarray) -> None:
+    """
+    Write a matrix to cache_path atomically.
+    
+    The data goes to a temporary file in the same directory first and is
+    then renamed into place, so a crashed or concurrent writer never leaves
+    a truncated .npy that later runs would load.
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, distance_matrix)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 
-def calculate_distance_matrix(locations: List[Dict]) -> np.ndarray:
+@njit(cache=True, nogil=True)
+def _distance_matrix_kernel(lat_rad: np.ndarray, lng_rad: np.ndarray,
+                            cos_lat: np.ndarray, out: np.ndarray) -> None:
+    """
+    Fill the symmetric haversine matrix in place (releases the GIL).
+    """
+    n = lat_rad.shape[0]
+    for i in range(n):
+        for j in range(i + 1, n):
+            a = (math.sin((lat_rad[j] - lat_rad[i]) / 2)**2
+                 + cos_lat[i] * cos_lat[j] * math.sin((lng_rad[j] - lng_rad[i]) / 2)**2)
+            d = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+            out[i, j] = d
+            out[j, i] = d
+
+
+def calculate_distance_matrix(locations: List[Dict],
+                              cache_dir: Optional[str] = None) -> np.ndarray:
     """
     Calculate distance matrix for all locations.
     
     Args:
         locations: List of dicts with 'lat' and 'lng' keys
+        cache_dir: Optional directory for dist_<digest>.npy files. A matrix
+            saved there by an earlier run is memory-mapped read-only instead
+            of recomputed
     
     Returns:
-        NxN numpy array where element [i][j] is distance from location i to j
+        NxN C-contiguous, read-only float32 array where element [i][j] is
+        distance from location i to j (shared by repeat calls; copy it
+        before modifying)
     
     Example:
         >>> locations = [
@@ -64,20 +191,69 @@ def calculate_distance_matrix(locations: List[Dict]) -> np.ndarray:
         >>> matrix = calculate_distance_matrix(locations)
         >>> matrix.shape  # (2, 2)
     """
-    n = len(locations)
-    distance_matrix = np.zeros((n, n))
+    # Vectorized haversine: evaluate every pair at once instead of
+    # calling haversine_distance() N² times from Python
+    lats = np.array([loc['lat'] for loc in locations], dtype=float)
+    lngs = np.array([loc['lng'] for loc in locations], dtype=float)
+    
+    # Same coordinates, same matrix: skip the O(N²) trig on repeat calls.
+    # Cached matrices are read-only, so they can be handed out as-is
+    key = hashlib.blake2b(lats.tobytes() + lngs.tobytes(), digest_size=16).digest()
+    cached = _MATRIX_CACHE.get(key)
+    if cached is not None:
+        return cached
+    
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = Path(cache_dir) / f"dist_{key.hex()}.npy"
+        if cache_path.exists():
+            distance_matrix = np.load(cache_path, mmap_mode='r')
+            _remember_matrix(key, distance_matrix)
+            return distance_matrix
+    
+    # Radians and cos(lat) depend on one location only: compute them N
+    # times here rather than once per pair
+    lat_rad = lats * _DEG2RAD
+    lng_rad = lngs * _DEG2RAD
+    cos_lat = np.cos(lat_rad)
+    
+    # float32 is plenty for km-scale distances and halves the memory
+    # traffic of the TSP inner loops
+    n = len(lats)
+    distance_matrix = np.zeros((n, n), dtype=np.float32)
+    
+    # Distances are symmetric with a zero diagonal, so only the upper
+    # triangle is computed and then mirrored
+    if NUMBA_AVAILABLE:
+        _distance_matrix_kernel(lat_rad, lng_rad, cos_lat, distance_matrix)
+    else:
+        rows, cols = np.triu_indices(n, k=1)
+        a = (np.sin((lat_rad[cols] - lat_rad[rows]) / 2)**2
+             + cos_lat[rows] * cos_lat[cols] * np.sin((lng_rad[cols] - lng_rad[rows]) / 2)**2)
+        upper = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+        distance_matrix[rows, cols] = upper
+        distance_matrix[cols, rows] = upper
     
-    for i in range(n):
-        for j in range(n):
-            if i != j:
-                distance_matrix[i][j] = haversine_distance(
-                    locations[i]['lat'], locations[i]['lng'],
-                    locations[j]['lat'], locations[j]['lng']
-                )
+    distance_matrix.setflags(write=False)
+    _remember_matrix(key, distance_matrix)
+    
+    if cache_path is not None:
+        _save_matrix(cache_path, distance_matrix)
     
     return distance_matrix
 
 
+@njit(cache=True)
+def _total_distance_kernel(route: np.ndarray, distance_matrix: np.ndarray) -> float:
+    """
+    Sum of consecutive route legs, accumulated in float64 (JIT-compiled when numba is available).
+    """
+    total = 0.0
+    for i in range(route.shape[0] - 1):
+        total += distance_matrix[route[i], route[i + 1]]
+    return total
+
+
 def calculate_total_distance(route: List[int], distance_matrix: np.ndarray) -> float:
     """
     Calculate total distance for a given route.
@@ -93,10 +269,20 @@ def calculate_total_distance(route: List[int], distance_matrix: np.ndarray) -> f
         >>> route = [0, 2, 1, 3, 0]  # Start at 0, visit 2, 1, 3, return to 0
         >>> total = calculate_total_distance(route, distance_matrix)
     """
-    total = 0.0
-    for i in range(len(route) - 1):
-        total += distance_matrix[route[i]][route[i + 1]]
-    return total
+    return float(_total_distance_kernel(
+        np.asarray(route, dtype=np.int64),
+        np.ascontiguousarray(distance_matrix)
+    ))
+
+
+# Compile the kernels at import so the first user action doesn't pay JIT cost
+_haversine_scalar(0.0, 0.0, 0.0, 0.0)
+_total_distance_kernel(np.zeros(2, dtype=np.int64), np.zeros((1, 1), dtype=np.float32))
+# ...and for the read-only matrices calculate_distance_matrix returns
+_readonly_matrix = np.zeros((1, 1), dtype=np.float32)
+_readonly_matrix.setflags(write=False)
+_total_distance_kernel(np.zeros(2, dtype=np.int64), _readonly_matrix)
+_distance_matrix_kernel(np.zeros(2), np.zeros(2), np.ones(2), np.zeros((2, 2), dtype=np.float32))
 
 
 def estimate_travel_time(distance_km: float, time_of_day: str = "normal") -> float:
@@ -116,18 +302,8 @@ def estimate_travel_time(distance_km: float, time_of_day: str = "normal") -> flo
     - Normal: 1.0x
     - Night: 0.9x faster
     """
-    # Base speed assumptions for Hyderabad
-    base_speed_kmph = 35  # Average city speed
-    
-    traffic_multipliers = {
-        'morning_rush': 1.4,   # 6-9 AM
-        'evening_rush': 1.5,   # 5-8 PM
-        'normal': 1.0,         # 9 AM - 5 PM
-        'night': 0.9           # 8 PM - 6 AM
-    }
-    
-    multiplier = traffic_multipliers.get(time_of_day, 1.0)
-    effective_speed = base_speed_kmph / multiplier
+    multiplier = TRAFFIC_MULTIPLIERS.get(time_of_day, 1.0)
+    effective_speed = BASE_SPEED_KMPH / multiplier
     
     time_hours = distance_km / effective_speed
     return time_hours
@@ -143,16 +319,12 @@ def get_traffic_condition(current_time: datetime) -> str:
     Returns:
         Traffic condition string
     """
-    hour = current_time.hour
-    
-    if 6 <= hour < 9:
-        return 'morning_rush'
-    elif 17 <= hour < 20:
-        return 'evening_rush'
-    elif 20 <= hour or hour < 6:
-        return 'night'
-    else:
-        return 'normal'
+    return _TRAFFIC_CONDITIONS[_HOUR_CONDITION[current_time.hour]]
+
+
+# Effective speed for each hour of the day (index 0-23). Plain floats, since
+# route metrics index it from a Python loop once per segment
+_HOURLY_SPEED_KMPH = tuple((BASE_SPEED_KMPH / _CONDITION_MULTIPLIER[_HOUR_CONDITION]).tolist())
 
 
 def format_time(hours: float) -> str:
@@ -171,9 +343,7 @@ def format_time(hours: float) -> str:
         >>> format_time(0.75)
         '45m'
     """
-    total_minutes = int(hours * 60)
-    h = total_minutes // 60
-    m = total_minutes % 60
+    h, m = divmod(int(hours * 60), 60)
     
     if h > 0:
         return f"{h}h {m}m"
@@ -198,14 +368,14 @@ def calculate_fuel_cost(distance_km: float, fuel_efficiency_kmpl: float = 12,
         >>> cost = calculate_fuel_cost(82.5, 12, 95)
         >>> print(f"₹{cost:.2f}")  # ₹653.13
     """
-    liters_needed = distance_km / fuel_efficiency_kmpl
-    cost = liters_needed * fuel_price_per_liter
-    return cost
+    # Plain float arithmetic: scalar callers never touch NumPy here
+    return distance_km / fuel_efficiency_kmpl * fuel_price_per_liter
 
 
 def calculate_route_metrics(route: List[int], locations: List[Dict], 
                             distance_matrix: np.ndarray,
-                            start_time: datetime = None) -> Dict:
+                            start_time: datetime = None,
+                            total_distance: float = None) -> Dict:
     """
     Calculate comprehensive metrics for a route.
     
@@ -214,6 +384,7 @@ def calculate_route_metrics(route: List[int], locations: List[Dict],
         locations: List of location dicts
         distance_matrix: Distance matrix
         start_time: Starting time (default: now)
+        total_distance: Route distance if the caller already has it
     
     Returns:
         Dictionary with all metrics
@@ -221,21 +392,26 @@ def calculate_route_metrics(route: List[int], locations: List[Dict],
     if start_time is None:
         start_time = datetime.now().replace(hour=9, minute=0)  # Default 9 AM
     
-    total_distance = calculate_total_distance(route, distance_matrix)
+    # All segment distances in one gather
+    r = np.asarray(route, dtype=np.int64)
+    segment_distances = distance_matrix[r[:-1], r[1:]].astype(np.float64)
     
-    # Calculate time considering traffic
-    current_time = start_time
+    if total_distance is None:
+        total_distance = float(segment_distances.sum())
+    
+    # Calculate time considering traffic. Each segment's speed depends on the
+    # hour it starts in, so this stays a loop, but only over plain floats
+    start_hour = (start_time.hour + start_time.minute / 60
+                  + (start_time.second + start_time.microsecond / 1e6) / 3600)
+    elapsed_hours = [0.0]
     total_time = 0.0
-    stop_times = [start_time]
     
-    for i in range(len(route) - 1):
-        segment_distance = distance_matrix[route[i]][route[i + 1]]
-        traffic_condition = get_traffic_condition(current_time)
-        segment_time = estimate_travel_time(segment_distance, traffic_condition)
-        
-        total_time += segment_time
-        current_time += timedelta(hours=segment_time)
-        stop_times.append(current_time)
+    for segment_distance in segment_distances.tolist():
+        hour = int(start_hour + total_time) % 24
+        total_time += segment_distance / _HOURLY_SPEED_KMPH[hour]
+        elapsed_hours.append(total_time)
+    
+    stop_times = [start_time + timedelta(hours=hours) for hours in elapsed_hours]
     
     fuel_cost = calculate_fuel_cost(total_distance)
     
@@ -268,6 +444,32 @@ def calculate_co2_emissions(distance_km: float, emission_factor: float = 2.31) -
     return co2_kg
 
 
+def calculate_trip_costs(distance_km) -> Tuple:
+    """
+    Travel time, fuel cost and CO2 for a distance at normal traffic.
+    
+    Works element-wise on NumPy arrays, so several routes can be
+    evaluated in one call. Same results as estimate_travel_time,
+    calculate_fuel_cost and calculate_co2_emissions with their defaults,
+    but the fuel volume is computed once and shared.
+    
+    Args:
+        distance_km: Distance in kilometers (float or array)
+    
+    Returns:
+        Tuple of (time_hours, fuel_cost_inr, co2_kg)
+    
+    Example:
+        >>> hours, cost, co2 = calculate_trip_costs(np.array([82.5, 120.0]))
+    """
+    liters_needed = distance_km / 12  # 12 kmpl
+    return (
+        distance_km / BASE_SPEED_KMPH,
+        liters_needed * 95,    # ₹ per liter
+        liters_needed * 2.31   # kg CO2 per liter
+    )
+
+
 # Test function
 if __name__ == "__main__":
     # Test distance calculation
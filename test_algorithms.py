@@ -61,6 +61,12 @@ try:
         verbose=True
     )
     
+    # Reference results for the bundled Hyderabad dataset
+    expected_km = {'naive': 205.50, 'nearest_neighbor': 117.83, 'optimized': 87.75}
+    for name, km in expected_km.items():
+        actual = comparison['distances'][name]
+        assert abs(actual - km) < 0.01, f"{name} route: expected {km:.2f} km, got {actual:.2f} km"
+    
     print("\n" + "="*70)
     print("✅ ALL TESTS PASSED!")
     print("="*70)
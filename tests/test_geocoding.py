@@ -0,0 +1,89 @@
+"""
+Tests for address loading and coordinate utilities
+Run from the repository root: python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+import numpy as np
+
+from src.utils.geocoding import (
+    load_addresses,
+    get_bounding_box,
+    validate_coordinates,
+    validate_coordinates_array
+)
+
+
+class BoundingBoxTest(unittest.TestCase):
+    def test_lat_lng_only_dicts(self):
+        bbox = get_bounding_box([{'lat': 17.4, 'lng': 78.4}, {'lat': 17.5, 'lng': 78.5}])
+        self.assertEqual(bbox['lat_min'], 17.4)
+        self.assertEqual(bbox['lat_max'], 17.5)
+        self.assertEqual(bbox['lng_min'], 78.4)
+        self.assertEqual(bbox['lng_max'], 78.5)
+        self.assertAlmostEqual(bbox['center_lat'], 17.45)
+        self.assertAlmostEqual(bbox['center_lng'], 78.45)
+
+
+class ValidateCoordinatesTest(unittest.TestCase):
+    def test_scalar(self):
+        self.assertTrue(validate_coordinates(17.4485, 78.3908))
+        self.assertTrue(validate_coordinates(np.float32(17.4485), np.float64(78.3908)))
+        self.assertTrue(validate_coordinates(Decimal('17.4485'), 78.3908))
+        self.assertFalse(validate_coordinates(28.6139, 77.2090))
+        self.assertFalse(validate_coordinates(None, 78.3908))
+        self.assertFalse(validate_coordinates('abc', 78.3908))
+        self.assertFalse(validate_coordinates(float('nan'), 78.3908))
+
+    def test_array_matches_scalar(self):
+        lats = np.array([17.4485, 28.6139, np.nan, 17.2, 17.61, 17.5])
+        lngs = np.array([78.3908, 77.2090, 78.4, 78.6, 78.4, 78.19])
+        mask = validate_coordinates_array(lats, lngs)
+
+        self.assertEqual(mask.dtype, bool)
+        self.assertEqual(mask.tolist(), [validate_coordinates(a, b) for a, b in zip(lats, lngs)])
+
+    def test_array_custom_bounds(self):
+        bounds = {'lat_min': 0, 'lat_max': 1, 'lng_min': 0, 'lng_max': 1}
+        self.assertEqual(validate_coordinates_array([0.5, 2.0], [0.5, 0.5], bounds).tolist(),
+                         [True, False])
+
+
+class LoadAddressesTest(unittest.TestCase):
+    HEADER = "id,customer_name,address,lat,lng,locality,package_count\n"
+
+    def write_csv(self, rows):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w') as f:
+            f.write(self.HEADER + "".join(rows))
+        self.addCleanup(os.unlink, path)
+        return path
+
+    def test_drops_out_of_bounds_and_bad_rows(self):
+        path = self.write_csv([
+            "1,A,Addr 1,17.44,78.39,Madhapur,2\n",
+            "2,B,Addr 2,28.61,77.20,Delhi,1\n",
+            "3,C,Addr 3,abc,78.39,Kondapur,\n",
+            "4,D,Addr 4,17.45,78.36,Gachibowli,\n",
+        ])
+        for chunksize in (None, 1, 2):
+            df = load_addresses(path, chunksize=chunksize)
+            self.assertEqual(df['id'].tolist(), [1, 4])
+            self.assertEqual(df['package_count'].tolist(), [2, 1])
+            self.assertEqual(df['locality'].dtype, 'category')
+
+    def test_missing_columns(self):
+        fd, path = tempfile.mkstemp(suffix='.csv')
+        with os.fdopen(fd, 'w') as f:
+            f.write("id,lat\n1,17.4\n")
+        self.addCleanup(os.unlink, path)
+        with self.assertRaises(ValueError):
+            load_addresses(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Tests for distance, cost and distance-matrix helpers
+Run from the repository root: python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.utils import helpers
+from src.utils.helpers import (
+    haversine_distance,
+    haversine_to_point,
+    calculate_distance_matrix,
+    calculate_trip_costs,
+    estimate_travel_time,
+    calculate_fuel_cost,
+    calculate_co2_emissions
+)
+
+
+def random_locations(n, seed):
+    rng = np.random.default_rng(seed)
+    return [
+        {'lat': 17.3 + 0.3 * rng.random(), 'lng': 78.3 + 0.3 * rng.random()}
+        for _ in range(n)
+    ]
+
+
+class HaversineTest(unittest.TestCase):
+    def test_to_point_matches_scalar(self):
+        locations = random_locations(25, seed=1)
+        lats = [loc['lat'] for loc in locations]
+        lngs = [loc['lng'] for loc in locations]
+        distances = haversine_to_point(lats, lngs, 17.4485, 78.3908)
+
+        self.assertEqual(distances.shape, (25,))
+        for lat, lng, d in zip(lats, lngs, distances):
+            self.assertAlmostEqual(d, haversine_distance(17.4485, 78.3908, lat, lng), places=9)
+
+    def test_matrix_matches_scalar(self):
+        locations = random_locations(12, seed=2)
+        matrix = calculate_distance_matrix(locations)
+
+        self.assertEqual(matrix.dtype, np.float32)
+        np.testing.assert_array_equal(matrix, matrix.T)
+        np.testing.assert_array_equal(np.diag(matrix), 0)
+        for i, a in enumerate(locations):
+            for j, b in enumerate(locations):
+                expected = haversine_distance(a['lat'], a['lng'], b['lat'], b['lng'])
+                self.assertAlmostEqual(float(matrix[i, j]), expected, places=4)
+
+
+class TripCostsTest(unittest.TestCase):
+    def test_matches_scalar_helpers(self):
+        for distance in (0.0, 12.5, 82.5, 120.0):
+            self.assertEqual(
+                calculate_trip_costs(distance),
+                (estimate_travel_time(distance),
+                 calculate_fuel_cost(distance),
+                 calculate_co2_emissions(distance))
+            )
+
+    def test_broadcasts_over_arrays(self):
+        distances = np.array([50.0, 82.5, 120.0])
+        hours, cost, co2 = calculate_trip_costs(distances)
+        np.testing.assert_allclose(cost, [395.8333333, 653.125, 950.0])
+        self.assertEqual(hours.shape, (3,))
+        self.assertEqual(co2.shape, (3,))
+
+
+class DistanceMatrixCacheTest(unittest.TestCase):
+    def setUp(self):
+        helpers._MATRIX_CACHE.clear()
+
+    def test_memo_returns_same_read_only_matrix(self):
+        locations = random_locations(20, seed=3)
+        first = calculate_distance_matrix(locations)
+        second = calculate_distance_matrix(locations)
+
+        self.assertIs(first, second)
+        self.assertFalse(first.flags.writeable)
+
+    def test_cache_dir_round_trip(self):
+        locations = random_locations(30, seed=4)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            computed = calculate_distance_matrix(locations, cache_dir=cache_dir)
+            files = os.listdir(cache_dir)
+            self.assertEqual(len(files), 1)
+            self.assertTrue(files[0].startswith('dist_') and files[0].endswith('.npy'))
+
+            # A fresh process has an empty memo: the matrix comes from disk
+            helpers._MATRIX_CACHE.clear()
+            loaded = calculate_distance_matrix(locations, cache_dir=cache_dir)
+            np.testing.assert_array_equal(loaded, computed)
+            self.assertFalse(loaded.flags.writeable)
+            self.assertIs(calculate_distance_matrix(locations, cache_dir=cache_dir), loaded)
+            del loaded
+
+    def test_different_order_is_a_different_matrix(self):
+        locations = random_locations(10, seed=5)
+        forward = calculate_distance_matrix(locations)
+        backward = calculate_distance_matrix(locations[::-1])
+        np.testing.assert_array_equal(backward, forward[::-1, ::-1])
+
+
+if __name__ == "__main__":
+    unittest.main()
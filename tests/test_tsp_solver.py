@@ -0,0 +1,101 @@
+"""
+Tests for the TSP solver: route validity and compiled vs pure-Python parity
+Run from the repository root: python -m unittest discover tests
+"""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from src.algorithms import tsp_solver
+from src.algorithms.tsp_solver import (
+    nearest_neighbor_tsp,
+    two_opt_optimization,
+    solve_tsp,
+    calculate_route_distance
+)
+
+
+def random_instance(n, seed):
+    """Symmetric Euclidean distance matrix for n random points."""
+    points = np.random.default_rng(seed).random((n, 2)) * 50
+    diff = points[:, None, :] - points[None, :, :]
+    return np.sqrt((diff ** 2).sum(axis=-1)).astype(np.float32)
+
+
+class RouteValidityTest(unittest.TestCase):
+    def assertValidTour(self, route, n, start_idx=0):
+        route = list(route)
+        self.assertEqual(route[0], start_idx)
+        self.assertEqual(route[-1], start_idx)
+        self.assertEqual(len(route), n + 1)
+        self.assertEqual(sorted(route[:-1]), list(range(n)))
+
+    def test_nearest_neighbor_small_n(self):
+        for n in range(1, 8):
+            D = random_instance(n, seed=n)
+            route, distance = nearest_neighbor_tsp(D, start_idx=0)
+            self.assertValidTour(route, n)
+            self.assertAlmostEqual(distance, calculate_route_distance(route, D), places=4)
+
+    def test_solve_tsp_small_n(self):
+        for n in range(2, 10):
+            D = random_instance(n, seed=100 + n)
+            for strategy in ('first-continue', 'best'):
+                for num_starts in (1, 3):
+                    for or_opt in (True, False):
+                        result = solve_tsp(D, start_idx=n // 2, strategy=strategy,
+                                           num_starts=num_starts, or_opt=or_opt)
+                        self.assertValidTour(result['route'], n, start_idx=n // 2)
+                        self.assertLessEqual(result['distance'], result['nn_distance'] + 1e-6)
+
+    def test_solve_tsp_options(self):
+        D = random_instance(60, seed=7)
+        result = solve_tsp(D, num_starts=4)
+        self.assertEqual(result['num_starts'], 4)
+        self.assertIn('or_opt_improvements', result['optimization_stats'])
+        self.assertAlmostEqual(result['distance'],
+                               calculate_route_distance(result['route'], D), places=4)
+
+        without_or_opt = solve_tsp(D, or_opt=False)
+        self.assertEqual(without_or_opt['optimization_stats']['or_opt_improvements'], 0)
+
+    def test_unknown_strategy(self):
+        D = random_instance(5, seed=0)
+        with self.assertRaises(ValueError):
+            solve_tsp(D, strategy='random')
+
+
+@unittest.skipIf(tsp_solver._two_opt_kernel is None, "numba not installed")
+class KernelParityTest(unittest.TestCase):
+    def optimize_both(self, D, strategy, or_opt):
+        route, _ = nearest_neighbor_tsp(D, 0)
+        compiled = two_opt_optimization(route, D, strategy=strategy, or_opt=or_opt)
+        with mock.patch.object(tsp_solver, '_two_opt_kernel', None):
+            python = two_opt_optimization(route, D, strategy=strategy, or_opt=or_opt)
+        return compiled, python
+
+    def test_identical_routes(self):
+        for seed in range(8):
+            D = random_instance(40 + 10 * seed, seed=seed)
+            for strategy in ('first-continue', 'best'):
+                for or_opt in (True, False):
+                    (c_route, c_dist, c_stats), (p_route, p_dist, p_stats) = \
+                        self.optimize_both(D, strategy, or_opt)
+                    np.testing.assert_array_equal(c_route, p_route)
+                    self.assertAlmostEqual(c_dist, p_dist, places=6)
+                    self.assertEqual(c_stats['total_improvements'], p_stats['total_improvements'])
+                    self.assertEqual(c_stats['or_opt_improvements'], p_stats['or_opt_improvements'])
+
+    def test_shared_condensed_matrix(self):
+        D = random_instance(50, seed=3)
+        route, _ = nearest_neighbor_tsp(D, 0)
+        condensed = tsp_solver.condensed_distance_matrix(D)
+        shared = two_opt_optimization(route, D, condensed=condensed)
+        inline = two_opt_optimization(route, D)
+        np.testing.assert_array_equal(shared[0], inline[0])
+
+
+if __name__ == "__main__":
+    unittest.main()